@@ -29,7 +29,9 @@ from app.matching_engine.config import TOLERANCE_PERCENT
 EXACT_TOLERANCE_PCT = Decimal("0.5")      # 0.5% tolerance for "exact"
 MULTI_MIN_FILL_PCT = Decimal("95")        # assembled total must be >= 95% of target
 MULTI_MAX_LEGS = 10                       # max transactions per multi-match
-PARTIAL_MIN_PCT = Decimal("10")           # overlap must be >= 10% of smaller side
+PARTIAL_MIN_PCT = Decimal("10")           # match must be >= 10% of larger side
+
+_ZERO = Decimal(0)                         # shared zero (Decimal is immutable)
 
 
 # ── Helpers ─────────────────────────────────────────────────────────────
@@ -40,7 +42,9 @@ def _amount(entry: dict) -> Decimal:
     Supports both ``source_amount`` (production pool entries) and
     ``amount`` (legacy / simplified test entries).
     """
-    raw = entry.get("source_amount") or entry.get("amount") or "0"
+    raw = entry.get("source_amount") or entry.get("amount")
+    if not raw:
+        return _ZERO
     return Decimal(str(raw))
 
 
@@ -126,7 +130,7 @@ def _greedy_multi(
 
     legs: list[dict] = []
     leg_indices: list[int] = []
-    assembled = Decimal("0")
+    assembled = _ZERO
 
     for idx, c in enumerate(candidates):
         if idx in used_indices:
@@ -220,8 +224,9 @@ def run_partial_matching(
     """
     Partial matching: largest vs. largest from opposite pool.
 
-    * Only matches if the overlap is >= ``PARTIAL_MIN_PCT`` % of the
-      smaller transaction's amount.
+    * Only matches if the matched amount is >= ``PARTIAL_MIN_PCT`` % of
+      the *larger* transaction's amount (checked as
+      ``matched * 100 >= larger * PARTIAL_MIN_PCT``).
     * The matched amount is ``min(a, b)``.
     * The remainder (difference) stays in pool for the next cycle.
 
@@ -246,16 +251,12 @@ def run_partial_matching(
             if b_amt <= 0:
                 continue
 
+            # The overlap is always 100% of the smaller side, so the only
+            # real gate is the match being >= PARTIAL_MIN_PCT % of the *larger* side.
+            # Compared multiplicatively to skip the Decimal divisions.
             matched = min(a_amt, b_amt)
-            smaller = min(a_amt, b_amt)
-
-            # Only match if overlap >= 10% of the smaller transaction
-            if smaller > 0 and (matched / smaller * 100) < PARTIAL_MIN_PCT:
-                continue
-
-            # Also reject if the match itself is < 10% of the *larger* side
             larger = max(a_amt, b_amt)
-            if larger > 0 and (matched / larger * 100) < PARTIAL_MIN_PCT:
+            if matched * 100 < larger * PARTIAL_MIN_PCT:
                 continue
 
             remainder_a = a_amt - matched
@@ -9,6 +9,7 @@ Per the TradeFlow PRD/FRD v2.0 data model:
 """
 
 import enum
+import os
 import random
 import string
 import uuid
@@ -38,21 +39,29 @@ from app.database import Base
 # ---------------------------------------------------------------------------
 
 _fernet: Fernet | None = None
+_fernet_key: bytes | None = None
 
 
 def _get_fernet() -> Fernet:
-    global _fernet
+    global _fernet, _fernet_key
     if _fernet is None:
-        _fernet = Fernet(settings.FERNET_KEY.encode())
+        _fernet_key = settings.FERNET_KEY.encode()
+        _fernet = Fernet(_fernet_key)
     return _fernet
 
 
 def configure_fernet(key: str | bytes) -> None:
-    """Override the Fernet key at runtime (used in tests)."""
-    global _fernet
+    """Override the Fernet key at runtime (used in tests).
+
+    The cipher is only rebuilt when the raw key actually changes.
+    """
+    global _fernet, _fernet_key
     if isinstance(key, str):
         key = key.encode()
+    if _fernet is not None and key == _fernet_key:
+        return
     _fernet = Fernet(key)
+    _fernet_key = key
 
 
 # ---------------------------------------------------------------------------
@@ -65,6 +74,12 @@ TIER_LIMITS: dict[int, Decimal] = {
     3: Decimal("500000"),
 }
 
+# bcrypt cost for PIN hashes; tests lower it via TRADEFLOW_BCRYPT_ROUNDS
+_BCRYPT_ROUNDS = int(os.getenv("TRADEFLOW_BCRYPT_ROUNDS", "12"))
+
+# Alphabet for the 5-char TF-XXXXX suffix (built once, not per call)
+_TF_ALPHABET = string.ascii_uppercase + string.digits
+
 
 # ---------------------------------------------------------------------------
 # Enums
@@ -154,8 +169,7 @@ class Trader(Base):
     @staticmethod
     def generate_tradeflow_id() -> str:
         """Generate a unique TF-XXXXX identifier (5 uppercase alphanumeric chars)."""
-        chars = string.ascii_uppercase + string.digits
-        suffix = "".join(random.choices(chars, k=5))
+        suffix = "".join(random.choices(_TF_ALPHABET, k=5))
         return f"TF-{suffix}"
 
     # ------------------------------------------------------------------
@@ -201,7 +215,7 @@ class Trader(Base):
 
     def set_pin(self, plain_pin: str) -> None:
         """Hash and store a PIN using bcrypt."""
-        hashed = _bcrypt.hashpw(plain_pin.encode(), _bcrypt.gensalt())
+        hashed = _bcrypt.hashpw(plain_pin.encode(), _bcrypt.gensalt(rounds=_BCRYPT_ROUNDS))
         self.pin_hash = hashed.decode()
 
     def verify_pin(self, plain_pin: str) -> bool:
@@ -118,13 +118,15 @@ class WhatsAppBot:
             return
 
         state = await self.get_state(sender)
-        flow_name = state.get("flow", "menu")
-        flow = self.FLOWS.get(flow_name, menu)
-
-        new_state = await flow.handle_text(sender=sender, text=text, state=state)
+        new_state = await self._route_text(sender, text, state)
         if new_state:
             await self.set_state(sender, new_state)
 
+    async def _route_text(self, sender: str, text: str, state: dict) -> dict | None:
+        """Pass text to the handler of the flow *state* is in."""
+        flow = self.FLOWS.get(state.get("flow", "menu"), menu)
+        return await flow.handle_text(sender=sender, text=text, state=state)
+
     async def handle_interactive(self, sender: str, reply_id: str):
         """Route an interactive reply (button/list) to the current flow."""
         state = await self.get_state(sender)
@@ -163,11 +165,20 @@ class WhatsAppBot:
             "filename": filename,
         }
         state["data"] = data
+
+        # Save the media first so the upload is kept even if the caption's
+        # flow handler fails.
         await self.set_state(sender, state)
 
-        # If the media has a caption, treat it as text input too
-        if caption:
-            await self.handle_message(sender, caption)
+        # If the media has a caption, treat it as text input too. It is
+        # routed against the state just saved (no second read), and only
+        # a new state from the flow is written back.
+        if caption and GLOBAL_COMMANDS.get(caption.strip().lower()) is None:
+            new_state = await self._route_text(sender, caption, state)
+            if new_state:
+                await self.set_state(sender, new_state)
+        elif caption:
+            await self._handle_global_command(sender, caption)
         else:
             await send_text(
                 sender,
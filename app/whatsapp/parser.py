@@ -41,11 +41,11 @@ _WORD_UNITS = {
     "fifty": 50, "sixty": 60, "seventy": 70, "eighty": 80, "ninety": 90,
 }
 
+# Scale words that close off a group; "hundred" only multiplies within one
 _WORD_SCALES = {
-    "hundred": Decimal("100"),
-    "thousand": Decimal("1_000"),
-    "million": Decimal("1_000_000"),
-    "billion": Decimal("1_000_000_000"),
+    "thousand": 1_000,
+    "million": 1_000_000,
+    "billion": 1_000_000_000,
 }
 
 
@@ -58,36 +58,21 @@ def _parse_word_number(text: str) -> Decimal | None:
       - "two hundred thousand"
       - "one hundred fifty million"
       - "five billion"
-    """
-    words = text.strip().lower().split()
-    if not words:
-        return None
-
-    # Quick check: at least one word must be a known number word
-    known = set(_WORD_UNITS) | set(_WORD_SCALES)
-    if not any(w in known for w in words):
-        return None
-
-    # Filter out connectors like "and"
-    words = [w for w in words if w != "and"]
 
-    current = Decimal("0")
-    result = Decimal("0")
+    Accumulates in ints (exact) and converts once at the end.
+    """
+    current = 0
+    result = 0
 
-    for word in words:
+    for word in text.lower().split():
         if word in _WORD_UNITS:
-            current += Decimal(str(_WORD_UNITS[word]))
+            current += _WORD_UNITS[word]
         elif word == "hundred":
-            if current == 0:
-                current = Decimal("1")
-            current *= _WORD_SCALES["hundred"]
-        elif word in ("thousand", "million", "billion"):
-            if current == 0:
-                current = Decimal("1")
-            current *= _WORD_SCALES[word]
-            result += current
-            current = Decimal("0")
-        else:
+            current = (current or 1) * 100
+        elif word in _WORD_SCALES:
+            result += (current or 1) * _WORD_SCALES[word]
+            current = 0
+        elif word != "and":  # "and" is a connector, e.g. "one hundred and five"
             return None  # Unknown word
 
     result += current
@@ -95,7 +80,7 @@ def _parse_word_number(text: str) -> Decimal | None:
     if result <= 0:
         return None
 
-    return result
+    return Decimal(result)
 
 
 def parse_amount(text: str) -> Decimal | None:
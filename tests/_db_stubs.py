@@ -0,0 +1,32 @@
+"""Lightweight database doubles shared by the API and flow tests."""
+
+
+class Result:
+    """Minimal stand-in for a SQLAlchemy Result returned by db.execute()."""
+
+    __slots__ = ("_value",)
+
+    def __init__(self, value):
+        self._value = value
+
+    def scalar_one_or_none(self):
+        return self._value
+
+    def scalar_one(self):
+        return self._value
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self._value
+
+
+def execute_returning(*results):
+    """Plain coroutine stand-in for ``execute`` that yields *results* in order."""
+    remaining = iter(results)
+
+    async def _execute(*args, **kwargs):
+        return next(remaining)
+
+    return _execute
@@ -5,6 +5,7 @@ Provides async test client, database session mocks, Redis mocks,
 and RSA key fixtures for JWT testing.
 """
 
+import os
 import uuid
 from datetime import datetime, timezone
 from decimal import Decimal
@@ -17,10 +18,18 @@ from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import rsa
 from httpx import ASGITransport, AsyncClient
 
-from app.database import get_db
-from app.redis_client import get_redis
-from app.models.trader import Trader, TraderStatus, configure_fernet
-from app.services import auth_service
+# Cheap bcrypt cost for PIN hashing — must be set before app.models is imported
+os.environ.setdefault("TRADEFLOW_BCRYPT_ROUNDS", "4")
+
+from app.database import get_db  # noqa: E402
+from app.redis_client import get_redis  # noqa: E402
+from app.models.trader import Trader, TraderStatus, configure_fernet  # noqa: E402
+from app.models.transaction import (  # noqa: E402
+    Transaction,
+    TransactionDirection,
+    TransactionStatus,
+)
+from app.services import auth_service  # noqa: E402
 
 
 # --- Fernet Key Fixture ---
@@ -105,6 +114,31 @@ def make_trader():
     return _make_trader
 
 
+# Built once — Decimal and enum values are immutable, so sharing is safe.
+_TXN_DEFAULTS = {
+    "direction": TransactionDirection.NGN_TO_CNY,
+    "source_amount": Decimal("1000000"),
+    "target_amount": Decimal("4677.42"),
+    "exchange_rate": Decimal("213.7931"),
+    "fee_amount": Decimal("20000"),
+    "fee_percentage": Decimal("2.00"),
+    "supplier_name": "Test Supplier",
+    "supplier_bank": "Test Bank",
+    "status": TransactionStatus.INITIATED,
+}
+
+
+def _make_transaction(trader_id, **overrides) -> Transaction:
+    """Create an INITIATED Transaction for *trader_id* with test defaults."""
+    return Transaction(**{**_TXN_DEFAULTS, "trader_id": trader_id, **overrides})
+
+
+@pytest.fixture
+def make_transaction():
+    """Factory fixture for creating Transaction instances."""
+    return _make_transaction
+
+
 @pytest.fixture
 def mock_db():
     """AsyncMock database session."""
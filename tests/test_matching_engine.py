@@ -1,7 +1,7 @@
 """Tests for the matching engine — matcher algorithms and priority scoring."""
 
-import pytest
 from decimal import Decimal
+from math import isclose
 
 from app.matching_engine.matcher import (
     find_exact_matches,
@@ -471,8 +471,8 @@ class TestPriorityScenarios:
     def test_small_old_entry_5k_tier1_23h(self):
         score = calculate_priority(hours_in_pool=23, amount_usd=5_000, kyc_tier=1)
         expected = 0.40 * (23 / 24 * 100) + 0.35 * 5 + 0.25 * 25
-        assert score == pytest.approx(expected)
-        assert score == pytest.approx(46.3333, abs=0.001)
+        assert isclose(score, expected, rel_tol=1e-6)
+        assert isclose(score, 46.3333, abs_tol=0.001)
 
     def test_scenario_ordering(self):
         new_t2 = calculate_priority(hours_in_pool=0, amount_usd=50_000, kyc_tier=2)
@@ -4,8 +4,9 @@ import re
 from decimal import Decimal
 
 import pytest
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, InvalidToken
 
+import app.models.trader as trader_module
 from app.models.trader import (
     Trader,
     TraderStatus,
@@ -129,6 +130,22 @@ class TestEncryption:
         with pytest.raises(ValueError, match="Failed to decrypt"):
             trader.get_bvn()
 
+    def test_configure_fernet_same_key_keeps_cipher(self, fernet_key):
+        """Re-configuring with the same key reuses the cached cipher."""
+        before = trader_module._get_fernet()
+        configure_fernet(fernet_key)
+        assert trader_module._get_fernet() is before
+
+    def test_configure_fernet_new_key_replaces_cipher(self, fernet_key):
+        """A different key rebuilds the cipher; old ciphertext is rejected."""
+        before = trader_module._get_fernet()
+        token = before.encrypt(b"12345678901")
+        configure_fernet(Fernet.generate_key())
+        after = trader_module._get_fernet()
+        assert after is not before
+        with pytest.raises(InvalidToken):
+            after.decrypt(token)
+
     def test_encrypt_value_static_method(self, fernet_key):
         """encrypt_value/decrypt_value work as static methods."""
         cipher = Trader.encrypt_value("hello")
@@ -5,9 +5,7 @@ import uuid
 from decimal import Decimal
 
 import pytest
-from cryptography.fernet import Fernet
 
-from app.models.trader import configure_fernet
 from app.models.transaction import (
     Transaction,
     TransactionDirection,
@@ -16,26 +14,66 @@ from app.models.transaction import (
     VALID_TRANSITIONS,
 )
 
+_REF_RE = re.compile(r"^TXN-[A-Z0-9]{8}$")
+_SOURCE_AMOUNT = Decimal("5000000")
+_ZERO = Decimal("0")
+_TRADER_ID = uuid.uuid4()  # never inspected; one id serves every fixture
+
+
+HAPPY_PATH = (
+    TransactionStatus.FUNDED,
+    TransactionStatus.MATCHING,
+    TransactionStatus.MATCHED,
+    TransactionStatus.PENDING_SETTLEMENT,
+    TransactionStatus.SETTLING,
+    TransactionStatus.COMPLETED,
+)
+
+
+def _shortest_paths() -> dict[TransactionStatus, list[TransactionStatus]]:
+    """BFS over VALID_TRANSITIONS from INITIATED (enum order breaks ties)."""
+    paths = {TransactionStatus.INITIATED: []}
+    queue = [TransactionStatus.INITIATED]
+    for current in queue:
+        for nxt in TransactionStatus:
+            if nxt in VALID_TRANSITIONS[current] and nxt not in paths:
+                paths[nxt] = paths[current] + [nxt]
+                queue.append(nxt)
+    return paths
+
+
+_SHORTEST_PATH = _shortest_paths()
+
+
+def _drive_to(txn: Transaction, target: TransactionStatus) -> None:
+    """Walk *txn* from INITIATED to *target* via real transitions."""
+    for s in _SHORTEST_PATH[target]:
+        txn.transition_to(s)
+
 
 # ---------------------------------------------------------------------------
 # Fixtures
 # ---------------------------------------------------------------------------
 
 
-@pytest.fixture(autouse=True)
-def _setup_fernet():
-    """Ensure Fernet is configured for encryption tests."""
-    configure_fernet(Fernet.generate_key())
+def _new_txn() -> Transaction:
+    return Transaction(
+        trader_id=_TRADER_ID,
+        direction=TransactionDirection.NGN_TO_CNY,
+        source_amount=_SOURCE_AMOUNT,
+    )
 
 
 @pytest.fixture
 def txn():
-    """Create a minimal Transaction instance."""
-    return Transaction(
-        trader_id=uuid.uuid4(),
-        direction=TransactionDirection.NGN_TO_CNY,
-        source_amount=Decimal("5000000"),
-    )
+    """Create a minimal Transaction instance (fresh per test, safe to mutate)."""
+    return _new_txn()
+
+
+@pytest.fixture(scope="class")
+def fresh_txn():
+    """Class-shared Transaction for read-only tests — do not mutate."""
+    return _new_txn()
 
 
 # ---------------------------------------------------------------------------
@@ -44,41 +82,41 @@ def txn():
 
 
 class TestTransactionCreation:
-    def test_create_with_valid_data(self, txn):
+    def test_create_with_valid_data(self, fresh_txn):
         """Transaction creation populates required fields and defaults."""
-        assert txn.id is not None
-        assert txn.reference is not None
-        assert txn.source_amount == Decimal("5000000")
-        assert txn.direction == TransactionDirection.NGN_TO_CNY
-        assert txn.status == TransactionStatus.INITIATED
-        assert txn.fee_amount == Decimal("0")
-        assert txn.fee_percentage == Decimal("0")
-        assert txn.match_id is None
-        assert txn.settlement_method is None
-        assert txn.funded_at is None
-        assert txn.matched_at is None
-        assert txn.settled_at is None
-        assert txn.created_at is not None
-
-    def test_reference_format(self, txn):
+        assert fresh_txn.id is not None
+        assert fresh_txn.reference is not None
+        assert fresh_txn.source_amount == _SOURCE_AMOUNT
+        assert fresh_txn.direction == TransactionDirection.NGN_TO_CNY
+        assert fresh_txn.status == TransactionStatus.INITIATED
+        assert fresh_txn.fee_amount == _ZERO
+        assert fresh_txn.fee_percentage == _ZERO
+        assert fresh_txn.match_id is None
+        assert fresh_txn.settlement_method is None
+        assert fresh_txn.funded_at is None
+        assert fresh_txn.matched_at is None
+        assert fresh_txn.settled_at is None
+        assert fresh_txn.created_at is not None
+
+    def test_reference_format(self, fresh_txn):
         """Auto-generated reference matches TXN-XXXXXXXX pattern."""
-        assert re.match(r"^TXN-[A-Z0-9]{8}$", txn.reference)
+        assert _REF_RE.match(fresh_txn.reference)
 
     def test_generate_reference_format(self):
         """generate_reference() produces correct format."""
         for _ in range(20):
             ref = Transaction.generate_reference()
-            assert re.match(r"^TXN-[A-Z0-9]{8}$", ref)
+            assert _REF_RE.match(ref)
 
     def test_reference_uniqueness(self):
         """Generated references are (very likely) unique."""
         refs = {Transaction.generate_reference() for _ in range(200)}
         assert len(refs) == 200
 
-    def test_repr_contains_reference(self, txn):
+    def test_repr_contains_reference(self, fresh_txn):
         """__repr__ includes the reference and amount."""
-        r = repr(txn)
-        assert txn.reference in r
+        r = repr(fresh_txn)
+        assert fresh_txn.reference in r
         assert "5000000" in r
 
 
@@ -90,169 +128,133 @@ class TestTransactionCreation:
 class TestStatusTransitions:
     """Every valid and invalid transition path is tested."""
 
-    # -- Happy-path transitions (the full lifecycle) ----------------------
-
-    def test_initiated_to_funded(self, txn):
-        txn.transition_to(TransactionStatus.FUNDED)
-        assert txn.status == TransactionStatus.FUNDED
-        assert txn.funded_at is not None
-
-    def test_funded_to_matching(self, txn):
-        txn.transition_to(TransactionStatus.FUNDED)
-        txn.transition_to(TransactionStatus.MATCHING)
-        assert txn.status == TransactionStatus.MATCHING
-
-    def test_matching_to_matched(self, txn):
-        txn.transition_to(TransactionStatus.FUNDED)
-        txn.transition_to(TransactionStatus.MATCHING)
-        txn.transition_to(TransactionStatus.MATCHED)
-        assert txn.status == TransactionStatus.MATCHED
-        assert txn.matched_at is not None
-
-    def test_matching_to_partial_matched(self, txn):
-        txn.transition_to(TransactionStatus.FUNDED)
-        txn.transition_to(TransactionStatus.MATCHING)
-        txn.transition_to(TransactionStatus.PARTIAL_MATCHED)
-        assert txn.status == TransactionStatus.PARTIAL_MATCHED
-        assert txn.matched_at is not None
-
-    def test_matched_to_pending_settlement(self, txn):
-        txn.transition_to(TransactionStatus.FUNDED)
-        txn.transition_to(TransactionStatus.MATCHING)
-        txn.transition_to(TransactionStatus.MATCHED)
-        txn.transition_to(TransactionStatus.PENDING_SETTLEMENT)
-        assert txn.status == TransactionStatus.PENDING_SETTLEMENT
-
-    def test_pending_settlement_to_settling(self, txn):
-        txn.transition_to(TransactionStatus.FUNDED)
-        txn.transition_to(TransactionStatus.MATCHING)
-        txn.transition_to(TransactionStatus.MATCHED)
-        txn.transition_to(TransactionStatus.PENDING_SETTLEMENT)
-        txn.transition_to(TransactionStatus.SETTLING)
-        assert txn.status == TransactionStatus.SETTLING
-
-    def test_settling_to_completed(self, txn):
-        txn.transition_to(TransactionStatus.FUNDED)
-        txn.transition_to(TransactionStatus.MATCHING)
-        txn.transition_to(TransactionStatus.MATCHED)
-        txn.transition_to(TransactionStatus.PENDING_SETTLEMENT)
-        txn.transition_to(TransactionStatus.SETTLING)
-        txn.transition_to(TransactionStatus.COMPLETED)
-        assert txn.status == TransactionStatus.COMPLETED
-        assert txn.settled_at is not None
+    # -- Valid single steps: happy path, cancellation/expiry, failure/refund
+
+    @pytest.mark.parametrize("from_status, to_status", [
+        pytest.param(
+            TransactionStatus.INITIATED, TransactionStatus.FUNDED,
+            id="initiated->funded",
+        ),
+        pytest.param(
+            TransactionStatus.FUNDED, TransactionStatus.MATCHING,
+            id="funded->matching",
+        ),
+        pytest.param(
+            TransactionStatus.MATCHING, TransactionStatus.MATCHED,
+            id="matching->matched",
+        ),
+        pytest.param(
+            TransactionStatus.MATCHING, TransactionStatus.PARTIAL_MATCHED,
+            id="matching->partial_matched",
+        ),
+        pytest.param(
+            TransactionStatus.MATCHED, TransactionStatus.PENDING_SETTLEMENT,
+            id="matched->pending_settlement",
+        ),
+        pytest.param(
+            TransactionStatus.PENDING_SETTLEMENT, TransactionStatus.SETTLING,
+            id="pending_settlement->settling",
+        ),
+        pytest.param(
+            TransactionStatus.SETTLING, TransactionStatus.COMPLETED,
+            id="settling->completed",
+        ),
+        pytest.param(
+            TransactionStatus.INITIATED, TransactionStatus.CANCELLED,
+            id="initiated->cancelled",
+        ),
+        pytest.param(
+            TransactionStatus.INITIATED, TransactionStatus.EXPIRED,
+            id="initiated->expired",
+        ),
+        pytest.param(
+            TransactionStatus.FUNDED, TransactionStatus.CANCELLED,
+            id="funded->cancelled",
+        ),
+        pytest.param(
+            TransactionStatus.FUNDED, TransactionStatus.EXPIRED,
+            id="funded->expired",
+        ),
+        pytest.param(
+            TransactionStatus.MATCHING, TransactionStatus.EXPIRED,
+            id="matching->expired",
+        ),
+        pytest.param(
+            TransactionStatus.SETTLING, TransactionStatus.FAILED,
+            id="settling->failed",
+        ),
+        pytest.param(
+            TransactionStatus.FAILED, TransactionStatus.REFUNDED,
+            id="failed->refunded",
+        ),
+        pytest.param(
+            TransactionStatus.EXPIRED, TransactionStatus.REFUNDED,
+            id="expired->refunded",
+        ),
+        pytest.param(
+            TransactionStatus.PARTIAL_MATCHED, TransactionStatus.MATCHING,
+            id="partial_matched->matching",
+        ),
+    ])
+    def test_valid_transition(self, txn, from_status, to_status):
+        _drive_to(txn, from_status)
+        txn.transition_to(to_status)
+        assert txn.status == to_status
 
     def test_full_happy_path(self, txn):
         """Walk the entire happy path: INITIATED -> COMPLETED."""
-        path = [
-            TransactionStatus.FUNDED,
-            TransactionStatus.MATCHING,
-            TransactionStatus.MATCHED,
-            TransactionStatus.PENDING_SETTLEMENT,
-            TransactionStatus.SETTLING,
-            TransactionStatus.COMPLETED,
-        ]
-        for s in path:
+        for s in HAPPY_PATH:
             txn.transition_to(s)
         assert txn.status == TransactionStatus.COMPLETED
 
-    # -- Cancellation / expiration paths ----------------------------------
-
-    def test_initiated_to_cancelled(self, txn):
-        txn.transition_to(TransactionStatus.CANCELLED)
-        assert txn.status == TransactionStatus.CANCELLED
-
-    def test_initiated_to_expired(self, txn):
-        txn.transition_to(TransactionStatus.EXPIRED)
-        assert txn.status == TransactionStatus.EXPIRED
-
-    def test_funded_to_cancelled(self, txn):
-        txn.transition_to(TransactionStatus.FUNDED)
-        txn.transition_to(TransactionStatus.CANCELLED)
-        assert txn.status == TransactionStatus.CANCELLED
-
-    def test_funded_to_expired(self, txn):
-        txn.transition_to(TransactionStatus.FUNDED)
-        txn.transition_to(TransactionStatus.EXPIRED)
-        assert txn.status == TransactionStatus.EXPIRED
-
-    def test_matching_to_expired(self, txn):
-        txn.transition_to(TransactionStatus.FUNDED)
-        txn.transition_to(TransactionStatus.MATCHING)
-        txn.transition_to(TransactionStatus.EXPIRED)
-        assert txn.status == TransactionStatus.EXPIRED
-
-    # -- Failure / refund paths -------------------------------------------
-
-    def test_settling_to_failed(self, txn):
-        txn.transition_to(TransactionStatus.FUNDED)
-        txn.transition_to(TransactionStatus.MATCHING)
-        txn.transition_to(TransactionStatus.MATCHED)
-        txn.transition_to(TransactionStatus.PENDING_SETTLEMENT)
-        txn.transition_to(TransactionStatus.SETTLING)
-        txn.transition_to(TransactionStatus.FAILED)
-        assert txn.status == TransactionStatus.FAILED
-
-    def test_failed_to_refunded(self, txn):
-        txn.transition_to(TransactionStatus.FUNDED)
-        txn.transition_to(TransactionStatus.MATCHING)
-        txn.transition_to(TransactionStatus.MATCHED)
-        txn.transition_to(TransactionStatus.PENDING_SETTLEMENT)
-        txn.transition_to(TransactionStatus.SETTLING)
-        txn.transition_to(TransactionStatus.FAILED)
-        txn.transition_to(TransactionStatus.REFUNDED)
-        assert txn.status == TransactionStatus.REFUNDED
-
-    def test_expired_to_refunded(self, txn):
-        txn.transition_to(TransactionStatus.EXPIRED)
-        txn.transition_to(TransactionStatus.REFUNDED)
-        assert txn.status == TransactionStatus.REFUNDED
-
-    # -- Partial match re-entry -------------------------------------------
-
-    def test_partial_matched_back_to_matching(self, txn):
-        txn.transition_to(TransactionStatus.FUNDED)
-        txn.transition_to(TransactionStatus.MATCHING)
-        txn.transition_to(TransactionStatus.PARTIAL_MATCHED)
-        txn.transition_to(TransactionStatus.MATCHING)
-        assert txn.status == TransactionStatus.MATCHING
-
     # -- Invalid transitions raise ----------------------------------------
 
-    def test_initiated_to_completed_raises(self, txn):
+    @pytest.mark.parametrize("from_status, bad_step", [
+        pytest.param(
+            TransactionStatus.INITIATED, TransactionStatus.COMPLETED,
+            id="initiated->completed",
+        ),
+        pytest.param(
+            TransactionStatus.COMPLETED, TransactionStatus.FUNDED,
+            id="completed->funded",
+        ),
+        pytest.param(
+            TransactionStatus.CANCELLED, TransactionStatus.FUNDED,
+            id="cancelled->funded",
+        ),
+        pytest.param(
+            TransactionStatus.REFUNDED, TransactionStatus.INITIATED,
+            id="refunded->initiated",
+        ),
+        # Cannot skip FUNDED step
+        pytest.param(
+            TransactionStatus.INITIATED, TransactionStatus.MATCHING,
+            id="initiated->matching",
+        ),
+        # Cannot skip MATCHING step
+        pytest.param(
+            TransactionStatus.FUNDED, TransactionStatus.MATCHED,
+            id="funded->matched",
+        ),
+    ])
+    def test_invalid_transition_raises(self, txn, from_status, bad_step):
+        _drive_to(txn, from_status)
         with pytest.raises(ValueError, match="Invalid transition"):
-            txn.transition_to(TransactionStatus.COMPLETED)
-
-    def test_completed_to_anything_raises(self, txn):
-        txn.transition_to(TransactionStatus.FUNDED)
-        txn.transition_to(TransactionStatus.MATCHING)
-        txn.transition_to(TransactionStatus.MATCHED)
-        txn.transition_to(TransactionStatus.PENDING_SETTLEMENT)
-        txn.transition_to(TransactionStatus.SETTLING)
-        txn.transition_to(TransactionStatus.COMPLETED)
-        with pytest.raises(ValueError, match="Invalid transition"):
-            txn.transition_to(TransactionStatus.FUNDED)
-
-    def test_cancelled_to_anything_raises(self, txn):
-        txn.transition_to(TransactionStatus.CANCELLED)
-        with pytest.raises(ValueError, match="Invalid transition"):
-            txn.transition_to(TransactionStatus.FUNDED)
-
-    def test_refunded_to_anything_raises(self, txn):
-        txn.transition_to(TransactionStatus.EXPIRED)
-        txn.transition_to(TransactionStatus.REFUNDED)
-        with pytest.raises(ValueError, match="Invalid transition"):
-            txn.transition_to(TransactionStatus.INITIATED)
-
-    def test_initiated_to_matching_raises(self, txn):
-        """Cannot skip FUNDED step."""
-        with pytest.raises(ValueError, match="Invalid transition"):
-            txn.transition_to(TransactionStatus.MATCHING)
-
-    def test_funded_to_matched_raises(self, txn):
-        """Cannot skip MATCHING step."""
-        txn.transition_to(TransactionStatus.FUNDED)
-        with pytest.raises(ValueError, match="Invalid transition"):
-            txn.transition_to(TransactionStatus.MATCHED)
+            txn.transition_to(bad_step)
+
+    # -- Full (from, to) matrix agrees with VALID_TRANSITIONS -------------
+
+    @pytest.mark.parametrize("to_status", list(TransactionStatus), ids=lambda s: s.value)
+    @pytest.mark.parametrize("from_status", list(TransactionStatus), ids=lambda s: s.value)
+    def test_transition_matrix(self, txn, from_status, to_status):
+        txn.status = from_status
+        if to_status in VALID_TRANSITIONS[from_status]:
+            txn.transition_to(to_status)
+            assert txn.status == to_status
+        else:
+            with pytest.raises(ValueError, match="Invalid transition"):
+                txn.transition_to(to_status)
+            assert txn.status == from_status
 
     # -- Static method validation -----------------------------------------
 
@@ -286,18 +288,19 @@ class TestLifecycleTimestamps:
         assert txn.funded_at is not None
 
     def test_matched_at_set_on_matched(self, txn):
-        txn.transition_to(TransactionStatus.FUNDED)
-        txn.transition_to(TransactionStatus.MATCHING)
+        _drive_to(txn, TransactionStatus.MATCHING)
         assert txn.matched_at is None
         txn.transition_to(TransactionStatus.MATCHED)
         assert txn.matched_at is not None
 
+    def test_matched_at_set_on_partial_matched(self, txn):
+        _drive_to(txn, TransactionStatus.MATCHING)
+        assert txn.matched_at is None
+        txn.transition_to(TransactionStatus.PARTIAL_MATCHED)
+        assert txn.matched_at is not None
+
     def test_settled_at_set_on_completed(self, txn):
-        txn.transition_to(TransactionStatus.FUNDED)
-        txn.transition_to(TransactionStatus.MATCHING)
-        txn.transition_to(TransactionStatus.MATCHED)
-        txn.transition_to(TransactionStatus.PENDING_SETTLEMENT)
-        txn.transition_to(TransactionStatus.SETTLING)
+        _drive_to(txn, TransactionStatus.SETTLING)
         assert txn.settled_at is None
         txn.transition_to(TransactionStatus.COMPLETED)
         assert txn.settled_at is not None
@@ -327,11 +330,12 @@ class TestEnums:
     def test_transaction_status_has_12_values(self):
         assert len(TransactionStatus) == 12
 
-    def test_direction_values(self):
-        assert TransactionDirection.NGN_TO_CNY.value == "ngn_to_cny"
-        assert TransactionDirection.CNY_TO_NGN.value == "cny_to_ngn"
-
-    def test_settlement_method_values(self):
-        assert SettlementMethod.MATCHED.value == "matched"
-        assert SettlementMethod.PARTIAL_MATCHED.value == "partial_matched"
-        assert SettlementMethod.CIPS_SETTLED.value == "cips_settled"
+    @pytest.mark.parametrize("member, value", [
+        (TransactionDirection.NGN_TO_CNY, "ngn_to_cny"),
+        (TransactionDirection.CNY_TO_NGN, "cny_to_ngn"),
+        (SettlementMethod.MATCHED, "matched"),
+        (SettlementMethod.PARTIAL_MATCHED, "partial_matched"),
+        (SettlementMethod.CIPS_SETTLED, "cips_settled"),
+    ])
+    def test_enum_value(self, member, value):
+        assert member.value == value
@@ -2,14 +2,18 @@
 
 import uuid
 from datetime import datetime, timedelta, timezone
-from decimal import Decimal
-from unittest.mock import AsyncMock, MagicMock, patch
+from typing import NamedTuple
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
 from app.models.trader import TraderStatus
-from app.models.transaction import Transaction, TransactionDirection, TransactionStatus
+from app.models.transaction import TransactionStatus
 from app.services import auth_service
+from app.tasks.payment_tasks import _expire_stale_transactions_async
+from tests._db_stubs import Result, execute_returning
+
+pytestmark = pytest.mark.asyncio
 
 
 # ---------------------------------------------------------------------------
@@ -28,6 +32,35 @@ def pool_redis(mock_redis):
     return mock_redis
 
 
+class _WebhookPatches(NamedTuple):
+    pool: AsyncMock
+    notify: MagicMock
+    verify: MagicMock
+
+
+@pytest.fixture
+def webhook_patches(monkeypatch):
+    """Stub the webhook route's pool manager, notifier and signature check."""
+    patches = _WebhookPatches(
+        pool=AsyncMock(), notify=MagicMock(), verify=MagicMock(return_value=True),
+    )
+    monkeypatch.setattr("app.api.webhooks.pool_manager", patches.pool)
+    monkeypatch.setattr("app.api.webhooks.send_status_update", patches.notify)
+    monkeypatch.setattr(
+        "app.services.payment_service.payment_service.verify_webhook_signature",
+        patches.verify,
+    )
+    return patches
+
+
+@pytest.fixture
+def expiry_notify(monkeypatch):
+    """Stub the notification task used by the expiry job."""
+    notify = MagicMock()
+    monkeypatch.setattr("app.tasks.notification_tasks.send_status_update", notify)
+    return notify
+
+
 @pytest.fixture
 def trader_with_pin(make_trader):
     """Active trader with PIN set and default tier-1 limits."""
@@ -36,37 +69,36 @@ def trader_with_pin(make_trader):
     return trader
 
 
-def _make_initiated_txn(trader_id, **overrides):
-    """Create an INITIATED Transaction ORM object with sensible defaults."""
-    defaults = dict(
-        trader_id=trader_id,
-        direction=TransactionDirection.NGN_TO_CNY,
-        source_amount=Decimal("1000000"),
-        target_amount=Decimal("4677.42"),
-        exchange_rate=Decimal("213.7931"),
-        fee_amount=Decimal("20000"),
-        fee_percentage=Decimal("2.00"),
-        supplier_name="Test Supplier",
-        supplier_bank="Test Bank",
-        status=TransactionStatus.INITIATED,
-    )
-    defaults.update(overrides)
-    return Transaction(**defaults)
+# Expected NGN payment (source + fee) for conftest's default transaction
+_EXPECTED_TOTAL = 1_020_000.0
+
+
+def _make_session_factory(*results):
+    """Build an ``async_session`` stand-in whose session.execute yields *results* in order."""
+    session = AsyncMock()
+    session.execute = execute_returning(*results)
+    session.commit = AsyncMock()
+
+    factory = MagicMock()
+    factory.return_value.__aenter__ = AsyncMock(return_value=session)
+    factory.return_value.__aexit__ = AsyncMock(return_value=False)
+    return factory
 
 
 def _build_webhook_payload(txn, amount=None):
     """Build a Providus-format webhook dict for a transaction."""
-    account_number = f"TF{txn.reference[4:]}"
+    ref = txn.reference
     if amount is None:
         amount = float(txn.source_amount + txn.fee_amount)
+    amount_str = str(amount)
     return {
-        "sessionId": f"SIM-{txn.reference}-12345",
-        "accountNumber": account_number,
-        "transactionAmount": str(amount),
-        "tranRemarks": f"Payment for {txn.reference}",
-        "settledAmount": str(amount),
+        "sessionId": f"SIM-{ref}-12345",
+        "accountNumber": f"TF{ref[4:]}",
+        "transactionAmount": amount_str,
+        "tranRemarks": f"Payment for {ref}",
+        "settledAmount": amount_str,
         "currency": "NGN",
-        "initiationTranRef": txn.reference,
+        "initiationTranRef": ref,
     }
 
 
@@ -78,17 +110,8 @@ def _setup_webhook_mocks(mock_db, trader, txn, completed_count=0):
     2. SELECT trader (for funded path)
     3. SELECT count completed (for priority calculation)
     """
-    txn_result = MagicMock()
-    txn_result.scalar_one_or_none = MagicMock(return_value=txn)
-
-    trader_result = MagicMock()
-    trader_result.scalar_one_or_none = MagicMock(return_value=trader)
-
-    count_result = MagicMock()
-    count_result.scalar_one = MagicMock(return_value=completed_count)
-
-    mock_db.execute = AsyncMock(
-        side_effect=[txn_result, trader_result, count_result],
+    mock_db.execute = execute_returning(
+        Result(txn), Result(trader), Result(completed_count),
     )
 
 
@@ -98,49 +121,42 @@ def _setup_webhook_mocks(mock_db, trader, txn, completed_count=0):
 
 
 class TestWebhookSuccessfulFunding:
-    """Exact and within-tolerance payments → FUNDED."""
-
-    @pytest.mark.asyncio
-    @patch("app.api.webhooks.pool_manager", new_callable=AsyncMock)
-    @patch("app.api.webhooks.send_status_update")
-    @patch("app.services.payment_service.payment_service.verify_webhook_signature", return_value=True)
-    async def test_exact_payment_funds_transaction(
-        self, mock_verify, mock_notify, mock_pool, client, mock_db, pool_redis, trader_with_pin,
+    """Exact, within-tolerance, 95-99% and overpaid amounts → FUNDED."""
+
+    @pytest.mark.parametrize("multiplier, classification", [
+        pytest.param(1.0, "exact", id="exact"),
+        pytest.param(0.99995, "exact", id="within-tolerance"),  # NGN 51 short
+        pytest.param(0.97, "adjusted", id="underpaid-97pct"),
+        pytest.param(1.10, "overpayment", id="overpaid-110pct"),
+    ])
+    async def test_payment_funds_transaction(
+        self, multiplier, classification, webhook_patches,
+        client, mock_db, pool_redis, trader_with_pin, make_transaction,
     ):
-        """Exact payment amount transitions to FUNDED (200)."""
-        txn = _make_initiated_txn(trader_with_pin.id)
+        """Accepted payments transition to FUNDED; only 95-99% adjusts amounts."""
+        txn = make_transaction(trader_with_pin.id)
+        original_source = txn.source_amount
+        original_fee = txn.fee_amount
+        assert float(original_source + original_fee) == _EXPECTED_TOTAL
         _setup_webhook_mocks(mock_db, trader_with_pin, txn)
 
-        payload = _build_webhook_payload(txn)
+        payload = _build_webhook_payload(txn, amount=_EXPECTED_TOTAL * multiplier)
         resp = await client.post("/api/v1/webhooks/providus", json=payload)
 
         assert resp.status_code == 200
         data = resp.json()
         assert data["status"] == "success"
         assert data["transaction_status"] == "funded"
-        assert data["classification"] == "exact"
+        assert data["classification"] == classification
         assert txn.status == TransactionStatus.FUNDED
         assert txn.funded_at is not None
-        mock_pool.add_to_pool.assert_called_once()
-
-    @pytest.mark.asyncio
-    @patch("app.api.webhooks.pool_manager", new_callable=AsyncMock)
-    @patch("app.api.webhooks.send_status_update")
-    @patch("app.services.payment_service.payment_service.verify_webhook_signature", return_value=True)
-    async def test_within_tolerance_funds_transaction(
-        self, mock_verify, mock_notify, mock_pool, client, mock_db, pool_redis, trader_with_pin,
-    ):
-        """Payment within +/- NGN 100 tolerance → FUNDED."""
-        txn = _make_initiated_txn(trader_with_pin.id)
-        _setup_webhook_mocks(mock_db, trader_with_pin, txn)
-
-        expected = float(txn.source_amount + txn.fee_amount)
-        payload = _build_webhook_payload(txn, amount=expected - 50)
-        resp = await client.post("/api/v1/webhooks/providus", json=payload)
-
-        assert resp.status_code == 200
-        assert resp.json()["classification"] == "exact"
-        assert txn.status == TransactionStatus.FUNDED
+        webhook_patches.pool.add_to_pool.assert_called_once()
+        if classification == "adjusted":
+            # Source amount should be reduced proportionally
+            assert txn.source_amount < original_source
+        else:
+            assert txn.source_amount == original_source
+            assert txn.fee_amount == original_fee
 
 
 # ---------------------------------------------------------------------------
@@ -149,50 +165,20 @@ class TestWebhookSuccessfulFunding:
 
 
 class TestWebhookUnderpayment:
-    """Underpayment handling: adjusted (95-99%) or held (< 95%)."""
-
-    @pytest.mark.asyncio
-    @patch("app.api.webhooks.pool_manager", new_callable=AsyncMock)
-    @patch("app.api.webhooks.send_status_update")
-    @patch("app.services.payment_service.payment_service.verify_webhook_signature", return_value=True)
-    async def test_underpayment_95_to_99_accepted_adjusted(
-        self, mock_verify, mock_notify, mock_pool, client, mock_db, pool_redis, trader_with_pin,
-    ):
-        """Payment at 97% of expected → accepted and amounts adjusted."""
-        txn = _make_initiated_txn(trader_with_pin.id)
-        original_source = txn.source_amount
-        _setup_webhook_mocks(mock_db, trader_with_pin, txn)
+    """Underpayment below 95% is held (95-99% is covered above)."""
 
-        expected = float(txn.source_amount + txn.fee_amount)
-        paid = expected * 0.97  # 97%
-        payload = _build_webhook_payload(txn, amount=paid)
-        resp = await client.post("/api/v1/webhooks/providus", json=payload)
-
-        assert resp.status_code == 200
-        data = resp.json()
-        assert data["classification"] == "adjusted"
-        assert data["transaction_status"] == "funded"
-        assert txn.status == TransactionStatus.FUNDED
-        # Source amount should be reduced proportionally
-        assert txn.source_amount < original_source
-
-    @pytest.mark.asyncio
-    @patch("app.api.webhooks.send_status_update")
-    @patch("app.services.payment_service.payment_service.verify_webhook_signature", return_value=True)
     async def test_underpayment_below_95_held(
-        self, mock_verify, mock_notify, client, mock_db, pool_redis, trader_with_pin,
+        self, webhook_patches, client, mock_db, pool_redis, trader_with_pin,
+        make_transaction,
     ):
         """Payment at 80% → held, notification sent."""
-        txn = _make_initiated_txn(trader_with_pin.id)
+        txn = make_transaction(trader_with_pin.id)
         # For the held path, db.execute is called: 1. txn lookup, 2. trader lookup (for notification)
-        txn_result = MagicMock()
-        txn_result.scalar_one_or_none = MagicMock(return_value=txn)
-        trader_result = MagicMock()
-        trader_result.scalar_one_or_none = MagicMock(return_value=trader_with_pin)
-        mock_db.execute = AsyncMock(side_effect=[txn_result, trader_result])
-
-        expected = float(txn.source_amount + txn.fee_amount)
-        paid = expected * 0.80
+        txn_result = Result(txn)
+        trader_result = Result(trader_with_pin)
+        mock_db.execute = execute_returning(txn_result, trader_result)
+
+        paid = _EXPECTED_TOTAL * 0.80
         payload = _build_webhook_payload(txn, amount=paid)
         resp = await client.post("/api/v1/webhooks/providus", json=payload)
 
@@ -202,43 +188,7 @@ class TestWebhookUnderpayment:
         # Transaction should still be INITIATED (not transitioned)
         assert txn.status == TransactionStatus.INITIATED
         # Notification sent about underpayment
-        mock_notify.delay.assert_called_once()
-
-
-# ---------------------------------------------------------------------------
-# TestWebhookOverpayment
-# ---------------------------------------------------------------------------
-
-
-class TestWebhookOverpayment:
-    """Overpayment → accepted as-is, no adjustment."""
-
-    @pytest.mark.asyncio
-    @patch("app.api.webhooks.pool_manager", new_callable=AsyncMock)
-    @patch("app.api.webhooks.send_status_update")
-    @patch("app.services.payment_service.payment_service.verify_webhook_signature", return_value=True)
-    async def test_overpayment_accepted(
-        self, mock_verify, mock_notify, mock_pool, client, mock_db, pool_redis, trader_with_pin,
-    ):
-        """Overpayment → accepted, source_amount unchanged."""
-        txn = _make_initiated_txn(trader_with_pin.id)
-        original_source = txn.source_amount
-        original_fee = txn.fee_amount
-        _setup_webhook_mocks(mock_db, trader_with_pin, txn)
-
-        expected = float(txn.source_amount + txn.fee_amount)
-        paid = expected * 1.10  # 10% overpayment
-        payload = _build_webhook_payload(txn, amount=paid)
-        resp = await client.post("/api/v1/webhooks/providus", json=payload)
-
-        assert resp.status_code == 200
-        data = resp.json()
-        assert data["classification"] == "overpayment"
-        assert data["transaction_status"] == "funded"
-        assert txn.status == TransactionStatus.FUNDED
-        # Source amount and fee not adjusted for overpayment
-        assert txn.source_amount == original_source
-        assert txn.fee_amount == original_fee
+        webhook_patches.notify.delay.assert_called_once()
 
 
 # ---------------------------------------------------------------------------
@@ -249,17 +199,15 @@ class TestWebhookOverpayment:
 class TestWebhookDuplicatePayment:
     """Already-funded transaction returns duplicate."""
 
-    @pytest.mark.asyncio
-    @patch("app.services.payment_service.payment_service.verify_webhook_signature", return_value=True)
     async def test_already_funded_returns_duplicate(
-        self, mock_verify, client, mock_db, pool_redis, trader_with_pin,
+        self, webhook_patches, client, mock_db, pool_redis, trader_with_pin,
+        make_transaction,
     ):
         """Already FUNDED → returns 'duplicate'."""
-        txn = _make_initiated_txn(trader_with_pin.id)
+        txn = make_transaction(trader_with_pin.id)
         txn.transition_to(TransactionStatus.FUNDED)
 
-        txn_result = MagicMock()
-        txn_result.scalar_one_or_none = MagicMock(return_value=txn)
+        txn_result = Result(txn)
         mock_db.execute = AsyncMock(return_value=txn_result)
 
         payload = _build_webhook_payload(txn)
@@ -277,61 +225,44 @@ class TestWebhookDuplicatePayment:
 class TestWebhookValidation:
     """Webhook input validation tests."""
 
-    @pytest.mark.asyncio
-    @patch("app.services.payment_service.payment_service.verify_webhook_signature", return_value=False)
-    async def test_invalid_signature_401(
-        self, mock_verify, client, mock_db, pool_redis,
-    ):
-        """Invalid HMAC signature → 401."""
-        payload = {
-            "sessionId": "SIM-TEST",
-            "accountNumber": "TFABCD1234",
-            "transactionAmount": "1000000",
-        }
-        resp = await client.post("/api/v1/webhooks/providus", json=payload)
-        assert resp.status_code == 401
-
-    @pytest.mark.asyncio
-    @patch("app.services.payment_service.payment_service.verify_webhook_signature", return_value=True)
-    async def test_missing_fields_400(
-        self, mock_verify, client, mock_db, pool_redis,
-    ):
-        """Missing required fields → 400."""
-        payload = {"accountNumber": "TFABCD1234"}  # missing transactionAmount, sessionId
-        resp = await client.post("/api/v1/webhooks/providus", json=payload)
-        assert resp.status_code == 400
-
-    @pytest.mark.asyncio
-    @patch("app.services.payment_service.payment_service.verify_webhook_signature", return_value=True)
-    async def test_bad_account_format_400(
-        self, mock_verify, client, mock_db, pool_redis,
-    ):
-        """Account number not starting with TF → 400."""
-        payload = {
-            "sessionId": "SIM-TEST",
-            "accountNumber": "XXBADFORMAT",
-            "transactionAmount": "1000000",
-        }
-        resp = await client.post("/api/v1/webhooks/providus", json=payload)
-        assert resp.status_code == 400
-
-    @pytest.mark.asyncio
-    @patch("app.services.payment_service.payment_service.verify_webhook_signature", return_value=True)
-    async def test_transaction_not_found_404(
-        self, mock_verify, client, mock_db, pool_redis,
+    @pytest.mark.parametrize("signature_ok, payload, expected_status", [
+        pytest.param(
+            False,
+            {"sessionId": "SIM-TEST", "accountNumber": "TFABCD1234", "transactionAmount": "1000000"},
+            401,
+            id="invalid-signature-401",
+        ),
+        pytest.param(
+            True,
+            {"accountNumber": "TFABCD1234"},  # missing transactionAmount, sessionId
+            400,
+            id="missing-fields-400",
+        ),
+        pytest.param(
+            True,
+            {"sessionId": "SIM-TEST", "accountNumber": "XXBADFORMAT", "transactionAmount": "1000000"},
+            400,
+            id="bad-account-format-400",
+        ),
+        pytest.param(
+            True,
+            {"sessionId": "SIM-TEST", "accountNumber": "TFNOTFOUND", "transactionAmount": "1000000"},
+            404,
+            id="transaction-not-found-404",
+        ),
+    ])
+    async def test_webhook_rejects(
+        self, signature_ok, payload, expected_status, monkeypatch, client, mock_db, pool_redis,
     ):
-        """Account number with no matching transaction → 404."""
-        txn_result = MagicMock()
-        txn_result.scalar_one_or_none = MagicMock(return_value=None)
-        mock_db.execute = AsyncMock(return_value=txn_result)
+        """Bad signature → 401, malformed payload → 400, unknown account → 404."""
+        monkeypatch.setattr(
+            "app.services.payment_service.payment_service.verify_webhook_signature",
+            lambda *args, **kwargs: signature_ok,
+        )
+        mock_db.execute = AsyncMock(return_value=Result(None))
 
-        payload = {
-            "sessionId": "SIM-TEST",
-            "accountNumber": "TFNOTFOUND",
-            "transactionAmount": "1000000",
-        }
         resp = await client.post("/api/v1/webhooks/providus", json=payload)
-        assert resp.status_code == 404
+        assert resp.status_code == expected_status
 
 
 # ---------------------------------------------------------------------------
@@ -342,100 +273,53 @@ class TestWebhookValidation:
 class TestTransactionExpiry:
     """Tests for the expire_stale_transactions Celery task."""
 
-    @pytest.mark.asyncio
-    @patch("app.tasks.notification_tasks.send_status_update")
-    async def test_stale_transaction_expired(self, mock_notify):
+    async def test_stale_transaction_expired(
+        self, expiry_notify, monkeypatch, make_transaction,
+    ):
         """Transaction older than PAYMENT_EXPIRY_HOURS is expired."""
-        from app.tasks.payment_tasks import _expire_stale_transactions_async
-
         trader = MagicMock()
         trader.phone = "+2348012345678"
 
-        txn = _make_initiated_txn(uuid.uuid4())
+        txn = make_transaction(uuid.uuid4())
         txn.created_at = datetime.now(timezone.utc) - timedelta(hours=3)
 
-        # Mock async session
-        mock_session = AsyncMock()
-        txn_result = MagicMock()
-        scalars = MagicMock()
-        scalars.all = MagicMock(return_value=[txn])
-        txn_result.scalars = MagicMock(return_value=scalars)
-
-        trader_result = MagicMock()
-        trader_result.scalar_one_or_none = MagicMock(return_value=trader)
+        mock_session_factory = _make_session_factory(Result([txn]), Result(trader))
 
-        mock_session.execute = AsyncMock(side_effect=[txn_result, trader_result])
-        mock_session.commit = AsyncMock()
-
-        mock_session_factory = MagicMock()
-        mock_session_factory.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session_factory.return_value.__aexit__ = AsyncMock(return_value=False)
-
-        with patch("app.database.async_session", mock_session_factory):
-            result = await _expire_stale_transactions_async()
+        monkeypatch.setattr("app.database.async_session", mock_session_factory)
+        result = await _expire_stale_transactions_async()
 
         assert result["expired_count"] == 1
         assert txn.reference in result["expired_references"]
         assert txn.status == TransactionStatus.EXPIRED
-        mock_notify.delay.assert_called_once()
+        expiry_notify.delay.assert_called_once()
 
-    @pytest.mark.asyncio
-    @patch("app.tasks.notification_tasks.send_status_update")
-    async def test_fresh_transaction_untouched(self, mock_notify):
+    async def test_fresh_transaction_untouched(self, expiry_notify, monkeypatch):
         """Transaction created recently is NOT expired."""
-        from app.tasks.payment_tasks import _expire_stale_transactions_async
-
         # No stale transactions
-        mock_session = AsyncMock()
-        txn_result = MagicMock()
-        scalars = MagicMock()
-        scalars.all = MagicMock(return_value=[])
-        txn_result.scalars = MagicMock(return_value=scalars)
-        mock_session.execute = AsyncMock(return_value=txn_result)
-        mock_session.commit = AsyncMock()
+        mock_session_factory = _make_session_factory(Result([]))
 
-        mock_session_factory = MagicMock()
-        mock_session_factory.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session_factory.return_value.__aexit__ = AsyncMock(return_value=False)
-
-        with patch("app.database.async_session", mock_session_factory):
-            result = await _expire_stale_transactions_async()
+        monkeypatch.setattr("app.database.async_session", mock_session_factory)
+        result = await _expire_stale_transactions_async()
 
         assert result["expired_count"] == 0
-        mock_notify.delay.assert_not_called()
+        expiry_notify.delay.assert_not_called()
 
-    @pytest.mark.asyncio
-    @patch("app.tasks.notification_tasks.send_status_update")
-    async def test_expiry_sends_notification(self, mock_notify):
+    async def test_expiry_sends_notification(
+        self, expiry_notify, monkeypatch, make_transaction,
+    ):
         """Expired transaction triggers notification to trader."""
-        from app.tasks.payment_tasks import _expire_stale_transactions_async
-
         trader = MagicMock()
         trader.phone = "+2348099999999"
 
-        txn = _make_initiated_txn(uuid.uuid4())
+        txn = make_transaction(uuid.uuid4())
         txn.created_at = datetime.now(timezone.utc) - timedelta(hours=5)
 
-        mock_session = AsyncMock()
-        txn_result = MagicMock()
-        scalars = MagicMock()
-        scalars.all = MagicMock(return_value=[txn])
-        txn_result.scalars = MagicMock(return_value=scalars)
-
-        trader_result = MagicMock()
-        trader_result.scalar_one_or_none = MagicMock(return_value=trader)
-
-        mock_session.execute = AsyncMock(side_effect=[txn_result, trader_result])
-        mock_session.commit = AsyncMock()
+        mock_session_factory = _make_session_factory(Result([txn]), Result(trader))
 
-        mock_session_factory = MagicMock()
-        mock_session_factory.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session_factory.return_value.__aexit__ = AsyncMock(return_value=False)
+        monkeypatch.setattr("app.database.async_session", mock_session_factory)
+        result = await _expire_stale_transactions_async()
 
-        with patch("app.database.async_session", mock_session_factory):
-            result = await _expire_stale_transactions_async()
-
-        mock_notify.delay.assert_called_once_with(
+        expiry_notify.delay.assert_called_once_with(
             "+2348099999999", txn.reference, "expired",
         )
 
@@ -448,37 +332,29 @@ class TestTransactionExpiry:
 class TestDevSimulatePayment:
     """Tests for the dev simulate-payment endpoint."""
 
-    @pytest.mark.asyncio
-    @patch("app.api.webhooks.pool_manager", new_callable=AsyncMock)
-    @patch("app.api.webhooks.send_status_update")
-    @patch("app.api.dev.settings")
     async def test_simulate_success_funds_transaction(
-        self, mock_settings, mock_notify, mock_pool, client, mock_db, pool_redis, trader_with_pin,
+        self, webhook_patches, monkeypatch, client, mock_db, pool_redis, trader_with_pin,
+        make_transaction,
     ):
         """Successful simulation → FUNDED."""
-        mock_settings.APP_ENV = "development"
+        monkeypatch.setattr("app.api.dev.settings.APP_ENV", "development")
 
-        txn = _make_initiated_txn(trader_with_pin.id)
-        exact_amount = float(txn.source_amount + txn.fee_amount)
+        txn = make_transaction(trader_with_pin.id)
 
         # First call: dev.py looks up txn by id
-        dev_txn_result = MagicMock()
-        dev_txn_result.scalar_one_or_none = MagicMock(return_value=txn)
+        dev_txn_result = Result(txn)
         # Then _process_payment calls: txn by reference, trader, count
-        webhook_txn_result = MagicMock()
-        webhook_txn_result.scalar_one_or_none = MagicMock(return_value=txn)
-        trader_result = MagicMock()
-        trader_result.scalar_one_or_none = MagicMock(return_value=trader_with_pin)
-        count_result = MagicMock()
-        count_result.scalar_one = MagicMock(return_value=0)
-
-        mock_db.execute = AsyncMock(
-            side_effect=[dev_txn_result, webhook_txn_result, trader_result, count_result],
+        webhook_txn_result = Result(txn)
+        trader_result = Result(trader_with_pin)
+        count_result = Result(0)
+
+        mock_db.execute = execute_returning(
+            dev_txn_result, webhook_txn_result, trader_result, count_result,
         )
 
         resp = await client.post(
             "/api/v1/dev/simulate-payment",
-            json={"transaction_id": str(txn.id), "amount": exact_amount},
+            json={"transaction_id": str(txn.id), "amount": _EXPECTED_TOTAL},
         )
 
         assert resp.status_code == 200
@@ -488,13 +364,11 @@ class TestDevSimulatePayment:
         assert "webhook_payload" in data
         assert txn.status == TransactionStatus.FUNDED
 
-    @pytest.mark.asyncio
-    @patch("app.api.dev.settings")
     async def test_simulate_production_mode_403(
-        self, mock_settings, client, mock_db, pool_redis,
+        self, monkeypatch, client, mock_db, pool_redis,
     ):
         """Production mode → 403."""
-        mock_settings.APP_ENV = "production"
+        monkeypatch.setattr("app.api.dev.settings.APP_ENV", "production")
 
         resp = await client.post(
             "/api/v1/dev/simulate-payment",
@@ -502,16 +376,13 @@ class TestDevSimulatePayment:
         )
         assert resp.status_code == 403
 
-    @pytest.mark.asyncio
-    @patch("app.api.dev.settings")
     async def test_simulate_not_found_404(
-        self, mock_settings, client, mock_db, pool_redis,
+        self, monkeypatch, client, mock_db, pool_redis,
     ):
         """Non-existent transaction → 404."""
-        mock_settings.APP_ENV = "development"
+        monkeypatch.setattr("app.api.dev.settings.APP_ENV", "development")
 
-        txn_result = MagicMock()
-        txn_result.scalar_one_or_none = MagicMock(return_value=None)
+        txn_result = Result(None)
         mock_db.execute = AsyncMock(return_value=txn_result)
 
         resp = await client.post(
@@ -520,19 +391,17 @@ class TestDevSimulatePayment:
         )
         assert resp.status_code == 404
 
-    @pytest.mark.asyncio
-    @patch("app.api.dev.settings")
     async def test_simulate_already_funded_409(
-        self, mock_settings, client, mock_db, pool_redis, trader_with_pin,
+        self, monkeypatch, client, mock_db, pool_redis, trader_with_pin,
+        make_transaction,
     ):
         """Already funded → 409."""
-        mock_settings.APP_ENV = "development"
+        monkeypatch.setattr("app.api.dev.settings.APP_ENV", "development")
 
-        txn = _make_initiated_txn(trader_with_pin.id)
+        txn = make_transaction(trader_with_pin.id)
         txn.transition_to(TransactionStatus.FUNDED)
 
-        txn_result = MagicMock()
-        txn_result.scalar_one_or_none = MagicMock(return_value=txn)
+        txn_result = Result(txn)
         mock_db.execute = AsyncMock(return_value=txn_result)
 
         resp = await client.post(
@@ -1,6 +1,5 @@
 """Tests for FX rate engine — rate fetching, caching, fees, circuit breaker."""
 
-import json
 from decimal import Decimal, ROUND_HALF_UP
 from unittest.mock import AsyncMock, MagicMock
 
@@ -19,6 +18,27 @@ from app.services.rate_service import (
     RateService,
 )
 
+_ZERO = Decimal("0")  # no prior volume, i.e. the standard fee tier
+_NGN_50M = Decimal("50000000")
+
+_CACHED_RATES_JSON = (
+    '{"ngn_per_usd": "1550.00", "cny_per_usd": "7.25", "ngn_per_cny": "213.7931",'
+    ' "timestamp": "2025-01-01T00:00:00+00:00", "source": "mock"}'
+)
+_BREAKER_OPEN_JSON = '{"reason": "volatile"}'
+
+
+async def _breaker_open_get(key):
+    """Redis GET double: only the circuit breaker key is set."""
+    if key == CIRCUIT_BREAKER_KEY:
+        return _BREAKER_OPEN_JSON
+    return None
+
+
+def _setex_keys(redis) -> list[str]:
+    """Keys written via SETEX on the mock Redis client, in call order."""
+    return [call.args[0] for call in redis.setex.call_args_list]
+
 
 # ---------------------------------------------------------------------------
 # Fixtures
@@ -34,6 +54,18 @@ def rate_redis(mock_redis):
     return mock_redis
 
 
+@pytest.fixture
+def auth_headers(mock_db, make_trader):
+    """JWT Authorization header for a trader that mock_db resolves."""
+    trader = make_trader()
+    mock_result = MagicMock()
+    mock_result.scalar_one_or_none = MagicMock(return_value=trader)
+    mock_db.execute.return_value = mock_result
+
+    token = auth_service.create_access_token(str(trader.id), trader.phone)
+    return {"Authorization": f"Bearer {token}"}
+
+
 # ---------------------------------------------------------------------------
 # MockRateProvider unit tests
 # ---------------------------------------------------------------------------
@@ -57,53 +89,24 @@ class TestMockRateProvider:
 
 class TestFeeTiers:
 
-    def test_standard_tier_zero_volume(self):
-        """$0 volume gets standard tier (2.00%)."""
-        name, pct = RateService.get_fee_tier(Decimal("0"))
-        assert name == "standard"
-        assert pct == Decimal("2.00")
-
-    def test_standard_tier_under_50k(self):
-        """$49,999 volume gets standard tier."""
-        name, pct = RateService.get_fee_tier(Decimal("49999"))
-        assert name == "standard"
-        assert pct == Decimal("2.00")
-
-    def test_silver_tier_at_50k(self):
-        """$50,000 volume gets silver tier (1.50%)."""
-        name, pct = RateService.get_fee_tier(Decimal("50000"))
-        assert name == "silver"
-        assert pct == Decimal("1.50")
-
-    def test_silver_tier_under_200k(self):
-        """$199,999 volume stays in silver tier."""
-        name, pct = RateService.get_fee_tier(Decimal("199999"))
-        assert name == "silver"
-        assert pct == Decimal("1.50")
-
-    def test_gold_tier_at_200k(self):
-        """$200,000 volume gets gold tier (1.00%)."""
-        name, pct = RateService.get_fee_tier(Decimal("200000"))
-        assert name == "gold"
-        assert pct == Decimal("1.00")
-
-    def test_gold_tier_under_500k(self):
-        """$499,999 volume stays in gold tier."""
-        name, pct = RateService.get_fee_tier(Decimal("499999"))
-        assert name == "gold"
-        assert pct == Decimal("1.00")
-
-    def test_platinum_tier_at_500k(self):
-        """$500,000 volume gets platinum tier (0.75%)."""
-        name, pct = RateService.get_fee_tier(Decimal("500000"))
-        assert name == "platinum"
-        assert pct == Decimal("0.75")
-
-    def test_platinum_tier_high_volume(self):
-        """$2M volume stays in platinum tier."""
-        name, pct = RateService.get_fee_tier(Decimal("2000000"))
-        assert name == "platinum"
-        assert pct == Decimal("0.75")
+    @pytest.mark.parametrize(
+        "volume, tier, pct",
+        [
+            ("0", "standard", "2.00"),
+            ("49999", "standard", "2.00"),
+            ("50000", "silver", "1.50"),
+            ("199999", "silver", "1.50"),
+            ("200000", "gold", "1.00"),
+            ("499999", "gold", "1.00"),
+            ("500000", "platinum", "0.75"),
+            ("2000000", "platinum", "0.75"),
+        ],
+    )
+    def test_tier_for_volume(self, volume, tier, pct):
+        """Each tier starts at its USD volume threshold and holds until the next."""
+        name, fee_pct = RateService.get_fee_tier(Decimal(volume))
+        assert name == tier
+        assert fee_pct == Decimal(pct)
 
 
 # ---------------------------------------------------------------------------
@@ -135,14 +138,7 @@ class TestRateFetching:
     @pytest.mark.asyncio
     async def test_fetch_rates_from_cache(self, rate_redis):
         """When cache exists, return cached data without calling provider."""
-        cached = json.dumps({
-            "ngn_per_usd": "1550.00",
-            "cny_per_usd": "7.25",
-            "ngn_per_cny": "213.7931",
-            "timestamp": "2025-01-01T00:00:00+00:00",
-            "source": "mock",
-        })
-        rate_redis.get = AsyncMock(return_value=cached)
+        rate_redis.get = AsyncMock(return_value=_CACHED_RATES_JSON)
 
         svc = RateService(rate_redis)
         rates = await svc.get_rates()
@@ -164,11 +160,11 @@ class TestQuoteGeneration:
     async def test_ngn_to_cny_quote(self, rate_redis):
         """Standard NGN->CNY quote with correct fee calculation."""
         svc = RateService(rate_redis)
-        quote = await svc.generate_quote("NGN", "CNY", Decimal("50000000"), Decimal("0"))
+        quote = await svc.generate_quote("NGN", "CNY", _NGN_50M, _ZERO)
 
         assert quote["source_currency"] == "NGN"
         assert quote["target_currency"] == "CNY"
-        assert Decimal(quote["source_amount"]) == Decimal("50000000")
+        assert Decimal(quote["source_amount"]) == _NGN_50M
         assert quote["fee_tier"] == "standard"
         assert Decimal(quote["fee_percentage"]) == Decimal("2.00")
 
@@ -190,17 +186,13 @@ class TestQuoteGeneration:
         assert "quote_valid_until" in quote
 
         # Quote should be stored in Redis
-        quote_stored = any(
-            call.args[0].startswith(QUOTE_KEY_PREFIX)
-            for call in rate_redis.setex.call_args_list
-        )
-        assert quote_stored
+        assert any(k.startswith(QUOTE_KEY_PREFIX) for k in _setex_keys(rate_redis))
 
     @pytest.mark.asyncio
     async def test_cny_to_ngn_quote(self, rate_redis):
         """CNY->NGN quote works correctly."""
         svc = RateService(rate_redis)
-        quote = await svc.generate_quote("CNY", "NGN", Decimal("100000"), Decimal("0"))
+        quote = await svc.generate_quote("CNY", "NGN", Decimal("100000"), _ZERO)
 
         assert quote["source_currency"] == "CNY"
         assert quote["target_currency"] == "NGN"
@@ -219,7 +211,7 @@ class TestQuoteGeneration:
         """Small amounts trigger the NGN 5,000 minimum fee."""
         svc = RateService(rate_redis)
         # 100,000 NGN * 2% = 2,000 NGN < min 5,000
-        quote = await svc.generate_quote("NGN", "CNY", Decimal("100000"), Decimal("0"))
+        quote = await svc.generate_quote("NGN", "CNY", Decimal("100000"), _ZERO)
 
         assert Decimal(quote["fee_amount"]) == MIN_FEE_NGN
 
@@ -228,7 +220,7 @@ class TestQuoteGeneration:
         """High-volume trader gets platinum fee tier."""
         svc = RateService(rate_redis)
         quote = await svc.generate_quote(
-            "NGN", "CNY", Decimal("50000000"), Decimal("600000"),  # $600K volume
+            "NGN", "CNY", _NGN_50M, Decimal("600000"),  # $600K volume
         )
 
         assert quote["fee_tier"] == "platinum"
@@ -240,7 +232,7 @@ class TestQuoteGeneration:
     async def test_savings_vs_bank(self, rate_redis):
         """Savings = bank fee (5%) - TradeFlow fee."""
         svc = RateService(rate_redis)
-        quote = await svc.generate_quote("NGN", "CNY", Decimal("50000000"), Decimal("0"))
+        quote = await svc.generate_quote("NGN", "CNY", _NGN_50M, _ZERO)
 
         savings = Decimal(quote["savings_vs_bank"])
         # Bank fee = 50M * 5% = 2,500,000
@@ -253,7 +245,7 @@ class TestQuoteGeneration:
         """Unsupported currency pair raises ValueError."""
         svc = RateService(rate_redis)
         with pytest.raises(ValueError, match="Unsupported"):
-            await svc.generate_quote("USD", "EUR", Decimal("1000"), Decimal("0"))
+            await svc.generate_quote("USD", "EUR", Decimal("1000"), _ZERO)
 
 
 # ---------------------------------------------------------------------------
@@ -273,8 +265,7 @@ class TestCircuitBreaker:
         await svc._check_circuit_breaker()
 
         # Should NOT have set the circuit breaker key
-        for call in rate_redis.setex.call_args_list:
-            assert not call.args[0].startswith("circuit_breaker")
+        assert not any(k.startswith("circuit_breaker") for k in _setex_keys(rate_redis))
 
     @pytest.mark.asyncio
     async def test_triggered_large_movement(self, rate_redis):
@@ -286,20 +277,16 @@ class TestCircuitBreaker:
         await svc._check_circuit_breaker()
 
         # Should have set the circuit breaker key
-        breaker_calls = [
-            call for call in rate_redis.setex.call_args_list
-            if call.args[0] == CIRCUIT_BREAKER_KEY
-        ]
-        assert len(breaker_calls) == 1
+        assert _setex_keys(rate_redis).count(CIRCUIT_BREAKER_KEY) == 1
 
     @pytest.mark.asyncio
     async def test_blocks_quotes_when_open(self, rate_redis):
         """When circuit breaker is open, quote generation raises error."""
-        rate_redis.get = AsyncMock(return_value='{"reason":"test"}')
+        rate_redis.get = AsyncMock(return_value=_BREAKER_OPEN_JSON)
 
         svc = RateService(rate_redis)
         with pytest.raises(CircuitBreakerOpenError):
-            await svc.generate_quote("NGN", "CNY", Decimal("1000000"), Decimal("0"))
+            await svc.generate_quote("NGN", "CNY", Decimal("1000000"), _ZERO)
 
     @pytest.mark.asyncio
     async def test_closed_when_no_key(self, rate_redis):
@@ -318,8 +305,7 @@ class TestCircuitBreaker:
         await svc._check_circuit_breaker()
 
         # No breaker set
-        for call in rate_redis.setex.call_args_list:
-            assert not call.args[0].startswith("circuit_breaker")
+        assert not any(k.startswith("circuit_breaker") for k in _setex_keys(rate_redis))
 
 
 # ---------------------------------------------------------------------------
@@ -343,12 +329,7 @@ class TestCurrentRatesEndpoint:
     @pytest.mark.asyncio
     async def test_circuit_breaker_503(self, client, rate_redis):
         """Returns 503 when circuit breaker is open."""
-        async def _get_by_key(key):
-            if key == CIRCUIT_BREAKER_KEY:
-                return '{"reason":"volatile"}'
-            return None
-
-        rate_redis.get = _get_by_key
+        rate_redis.get = _breaker_open_get
 
         response = await client.get("/api/v1/rates/current")
         assert response.status_code == 503
@@ -363,19 +344,12 @@ class TestCurrentRatesEndpoint:
 class TestQuoteEndpoint:
 
     @pytest.mark.asyncio
-    async def test_returns_200(self, client, mock_db, rate_redis, make_trader):
+    async def test_returns_200(self, client, rate_redis, auth_headers):
         """Authenticated trader gets a valid quote."""
-        trader = make_trader()
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none = MagicMock(return_value=trader)
-        mock_db.execute.return_value = mock_result
-
-        access = auth_service.create_access_token(str(trader.id), trader.phone)
-
         response = await client.get(
             "/api/v1/rates/quote",
             params={"source": "NGN", "target": "CNY", "amount": "50000000"},
-            headers={"Authorization": f"Bearer {access}"},
+            headers=auth_headers,
         )
         assert response.status_code == 200
         data = response.json()
@@ -388,19 +362,12 @@ class TestQuoteEndpoint:
         assert float(data["savings_vs_bank"]) > 0
 
     @pytest.mark.asyncio
-    async def test_unsupported_pair_400(self, client, mock_db, rate_redis, make_trader):
+    async def test_unsupported_pair_400(self, client, rate_redis, auth_headers):
         """Unsupported currency pair returns 400."""
-        trader = make_trader()
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none = MagicMock(return_value=trader)
-        mock_db.execute.return_value = mock_result
-
-        access = auth_service.create_access_token(str(trader.id), trader.phone)
-
         response = await client.get(
             "/api/v1/rates/quote",
             params={"source": "USD", "target": "EUR", "amount": "1000"},
-            headers={"Authorization": f"Bearer {access}"},
+            headers=auth_headers,
         )
         assert response.status_code == 400
         assert "supported" in response.json()["detail"]
@@ -415,26 +382,14 @@ class TestQuoteEndpoint:
         assert response.status_code == 422
 
     @pytest.mark.asyncio
-    async def test_circuit_breaker_503(self, client, mock_db, rate_redis, make_trader):
+    async def test_circuit_breaker_503(self, client, rate_redis, auth_headers):
         """Returns 503 when circuit breaker is open."""
-        trader = make_trader()
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none = MagicMock(return_value=trader)
-        mock_db.execute.return_value = mock_result
-
-        access = auth_service.create_access_token(str(trader.id), trader.phone)
-
         # Circuit breaker open for generate_quote, but not for initial get_rates
-        async def _get_by_key(key):
-            if key == CIRCUIT_BREAKER_KEY:
-                return '{"reason":"volatile"}'
-            return None
-
-        rate_redis.get = _get_by_key
+        rate_redis.get = _breaker_open_get
 
         response = await client.get(
             "/api/v1/rates/quote",
             params={"source": "NGN", "target": "CNY", "amount": "50000000"},
-            headers={"Authorization": f"Bearer {access}"},
+            headers=auth_headers,
         )
         assert response.status_code == 503
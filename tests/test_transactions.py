@@ -1,15 +1,32 @@
 """Tests for transaction endpoints — create, get, list, cancel."""
 
-import json
 import uuid
 from decimal import Decimal
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock
 
 import pytest
 
-from app.models.trader import TraderStatus
-from app.models.transaction import Transaction, TransactionDirection, TransactionStatus
+from app.models.trader import Trader, TraderStatus
+from app.models.transaction import TransactionStatus
 from app.services import auth_service
+from tests._db_stubs import Result, execute_returning
+
+
+_CREATE_PAYLOAD = {
+    "source_currency": "NGN",
+    "target_currency": "CNY",
+    "source_amount": 1000000,
+    "supplier_name": "Shenzhen Electronics Co.",
+    "supplier_bank": "Bank of China",
+    "supplier_account": "621082100123456789",
+    "pin": "1234",
+}
+
+# Cached quote as RateService stores it under quote:<id>
+_QUOTE_JSON = (
+    '{"mid_market_rate": "213.7931", "target_amount": "4677.42",'
+    ' "fee_percentage": "2.00", "fee_amount": "20000.00"}'
+)
 
 
 # ---------------------------------------------------------------------------
@@ -26,12 +43,18 @@ def rate_redis(mock_redis):
     return mock_redis
 
 
+@pytest.fixture(scope="session")
+def pin_hash():
+    """bcrypt hash of PIN "1234", computed once per session."""
+    trader = Trader()
+    trader.set_pin("1234")
+    return trader.pin_hash
+
+
 @pytest.fixture
-def trader_with_pin(make_trader):
+def trader_with_pin(make_trader, pin_hash):
     """Active trader with PIN set and default tier-1 limits."""
-    trader = make_trader(status=TraderStatus.ACTIVE)
-    trader.set_pin("1234")
-    return trader
+    return make_trader(status=TraderStatus.ACTIVE, pin_hash=pin_hash)
 
 
 @pytest.fixture
@@ -45,23 +68,13 @@ def auth_headers(trader_with_pin):
 
 @pytest.fixture
 def valid_create_payload():
-    """Valid NGN→CNY transaction creation payload."""
-    return {
-        "source_currency": "NGN",
-        "target_currency": "CNY",
-        "source_amount": 1000000,
-        "supplier_name": "Shenzhen Electronics Co.",
-        "supplier_bank": "Bank of China",
-        "supplier_account": "621082100123456789",
-        "pin": "1234",
-    }
+    """Valid NGN→CNY transaction creation payload (a fresh copy per test)."""
+    return dict(_CREATE_PAYLOAD)
 
 
 def _setup_trader_lookup(mock_db, trader):
     """Configure mock_db.execute to return *trader* for every call."""
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none = MagicMock(return_value=trader)
-    mock_db.execute = AsyncMock(return_value=mock_result)
+    mock_db.execute = AsyncMock(return_value=Result(trader))
 
 
 # ---------------------------------------------------------------------------
@@ -116,13 +129,10 @@ class TestCreateTransaction:
         _setup_trader_lookup(mock_db, trader_with_pin)
 
         payload = {
+            **_CREATE_PAYLOAD,
             "source_currency": "CNY",
             "target_currency": "NGN",
             "source_amount": 10000,
-            "supplier_name": "Nigerian Imports Ltd",
-            "supplier_bank": "First Bank",
-            "supplier_account": "1234567890",
-            "pin": "1234",
         }
 
         resp = await client.post(
@@ -159,15 +169,7 @@ class TestCreateTransaction:
         """100,000 NGN × 2 % = 2,000 < min 5,000 → fee is 5,000."""
         _setup_trader_lookup(mock_db, trader_with_pin)
 
-        payload = {
-            "source_currency": "NGN",
-            "target_currency": "CNY",
-            "source_amount": 100000,
-            "supplier_name": "Test",
-            "supplier_bank": "Test Bank",
-            "supplier_account": "1234567890",
-            "pin": "1234",
-        }
+        payload = {**_CREATE_PAYLOAD, "source_amount": 100000}
 
         resp = await client.post(
             "/api/v1/transactions/", json=payload, headers=auth_headers,
@@ -185,16 +187,9 @@ class TestCreateTransaction:
         """Using a cached quote applies the quoted rate/fee values."""
         _setup_trader_lookup(mock_db, trader_with_pin)
 
-        quote_data = json.dumps({
-            "mid_market_rate": "213.7931",
-            "target_amount": "4677.42",
-            "fee_percentage": "2.00",
-            "fee_amount": "20000.00",
-        })
-
         async def _get_by_key(key):
             if key == "quote:QT-TEST123":
-                return quote_data
+                return _QUOTE_JSON
             return None
 
         rate_redis.get = _get_by_key
@@ -226,21 +221,6 @@ class TestCreateTransaction:
 
     # --- PIN verification ------------------------------------------------
 
-    @pytest.mark.asyncio
-    async def test_create_wrong_pin_401(
-        self, client, mock_db, rate_redis, trader_with_pin,
-        auth_headers, valid_create_payload,
-    ):
-        """Wrong PIN returns 401."""
-        _setup_trader_lookup(mock_db, trader_with_pin)
-
-        valid_create_payload["pin"] = "9999"
-        resp = await client.post(
-            "/api/v1/transactions/", json=valid_create_payload, headers=auth_headers,
-        )
-        assert resp.status_code == 401
-        assert "Invalid PIN" in resp.json()["detail"]
-
     @pytest.mark.asyncio
     async def test_create_no_pin_set_400(
         self, client, mock_db, rate_redis, make_trader,
@@ -253,138 +233,54 @@ class TestCreateTransaction:
         token = auth_service.create_access_token(str(trader.id), trader.phone)
         headers = {"Authorization": f"Bearer {token}"}
 
-        payload = {
-            "source_currency": "NGN",
-            "target_currency": "CNY",
-            "source_amount": 1000000,
-            "supplier_name": "Test",
-            "supplier_bank": "Test Bank",
-            "supplier_account": "1234567890",
-            "pin": "1234",
-        }
-
         resp = await client.post(
-            "/api/v1/transactions/", json=payload, headers=headers,
+            "/api/v1/transactions/", json=_CREATE_PAYLOAD, headers=headers,
         )
         assert resp.status_code == 400
         assert "PIN has not been set" in resp.json()["detail"]
 
     # --- Validation errors -----------------------------------------------
 
-    @pytest.mark.asyncio
-    async def test_create_below_minimum_ngn_400(
-        self, client, mock_db, rate_redis, trader_with_pin, auth_headers,
-    ):
-        """NGN amount below 10,000 returns 400."""
-        _setup_trader_lookup(mock_db, trader_with_pin)
-
-        payload = {
-            "source_currency": "NGN",
-            "target_currency": "CNY",
-            "source_amount": 5000,
-            "supplier_name": "Test",
-            "supplier_bank": "Test Bank",
-            "supplier_account": "1234567890",
-            "pin": "1234",
-        }
-
-        resp = await client.post(
-            "/api/v1/transactions/", json=payload, headers=auth_headers,
-        )
-        assert resp.status_code == 400
-        assert "Minimum" in resp.json()["detail"]
-        assert "NGN" in resp.json()["detail"]
-
-    @pytest.mark.asyncio
-    async def test_create_below_minimum_cny_400(
-        self, client, mock_db, rate_redis, trader_with_pin, auth_headers,
-    ):
-        """CNY amount below 100 returns 400."""
-        _setup_trader_lookup(mock_db, trader_with_pin)
-
-        payload = {
-            "source_currency": "CNY",
-            "target_currency": "NGN",
-            "source_amount": 50,
-            "supplier_name": "Test",
-            "supplier_bank": "Test Bank",
-            "supplier_account": "1234567890",
-            "pin": "1234",
-        }
-
-        resp = await client.post(
-            "/api/v1/transactions/", json=payload, headers=auth_headers,
-        )
-        assert resp.status_code == 400
-        assert "Minimum" in resp.json()["detail"]
-        assert "CNY" in resp.json()["detail"]
-
-    @pytest.mark.asyncio
-    async def test_create_unsupported_pair_400(
-        self, client, mock_db, rate_redis, trader_with_pin, auth_headers,
-    ):
-        """Same-currency pair (NGN/NGN) returns 400."""
-        _setup_trader_lookup(mock_db, trader_with_pin)
-
-        payload = {
-            "source_currency": "NGN",
-            "target_currency": "NGN",
-            "source_amount": 1000000,
-            "supplier_name": "Test",
-            "supplier_bank": "Test Bank",
-            "supplier_account": "1234567890",
-            "pin": "1234",
-        }
-
-        resp = await client.post(
-            "/api/v1/transactions/", json=payload, headers=auth_headers,
-        )
-        assert resp.status_code == 400
-        assert "supported" in resp.json()["detail"].lower()
-
-    @pytest.mark.asyncio
-    async def test_create_invalid_supplier_account_short_422(
-        self, client, mock_db, rate_redis, trader_with_pin, auth_headers,
-    ):
-        """Supplier account with < 10 digits fails schema validation (422)."""
-        _setup_trader_lookup(mock_db, trader_with_pin)
-
-        payload = {
-            "source_currency": "NGN",
-            "target_currency": "CNY",
-            "source_amount": 1000000,
-            "supplier_name": "Test",
-            "supplier_bank": "Test Bank",
-            "supplier_account": "12345",
-            "pin": "1234",
-        }
-
-        resp = await client.post(
-            "/api/v1/transactions/", json=payload, headers=auth_headers,
-        )
-        assert resp.status_code == 422
-
-    @pytest.mark.asyncio
-    async def test_create_invalid_supplier_account_alpha_422(
-        self, client, mock_db, rate_redis, trader_with_pin, auth_headers,
+    @pytest.mark.parametrize("overrides, status_code, detail_parts", [
+        pytest.param(
+            {"source_amount": 5000}, 400, ("Minimum", "NGN"),
+            id="below-minimum-ngn",
+        ),
+        pytest.param(
+            {"source_currency": "CNY", "target_currency": "NGN", "source_amount": 50},
+            400, ("Minimum", "CNY"),
+            id="below-minimum-cny",
+        ),
+        pytest.param(
+            {"target_currency": "NGN"}, 400, ("supported",),
+            id="unsupported-pair",
+        ),
+        pytest.param(
+            {"supplier_account": "12345"}, 422, (),
+            id="supplier-account-short",
+        ),
+        pytest.param(
+            {"supplier_account": "ABCDEFGHIJ"}, 422, (),
+            id="supplier-account-alpha",
+        ),
+        pytest.param({"pin": "9999"}, 401, ("Invalid PIN",), id="wrong-pin"),
+    ])
+    @pytest.mark.asyncio
+    async def test_create_rejected(
+        self, client, mock_db, rate_redis, trader_with_pin,
+        auth_headers, valid_create_payload, overrides, status_code, detail_parts,
     ):
-        """Supplier account with letters fails schema validation (422)."""
+        """Invalid amounts, pairs, supplier accounts and PINs are rejected."""
         _setup_trader_lookup(mock_db, trader_with_pin)
 
-        payload = {
-            "source_currency": "NGN",
-            "target_currency": "CNY",
-            "source_amount": 1000000,
-            "supplier_name": "Test",
-            "supplier_bank": "Test Bank",
-            "supplier_account": "ABCDEFGHIJ",
-            "pin": "1234",
-        }
-
         resp = await client.post(
-            "/api/v1/transactions/", json=payload, headers=auth_headers,
+            "/api/v1/transactions/",
+            json={**valid_create_payload, **overrides},
+            headers=auth_headers,
         )
-        assert resp.status_code == 422
+        assert resp.status_code == status_code
+        for part in detail_parts:
+            assert part in resp.json()["detail"]
 
     # --- Monthly limit ---------------------------------------------------
 
@@ -399,18 +295,9 @@ class TestCreateTransaction:
         trader_with_pin.monthly_used = Decimal("4999")
         trader_with_pin.monthly_limit = Decimal("5000")
 
-        payload = {
-            "source_currency": "NGN",
-            "target_currency": "CNY",
-            "source_amount": 1000000,  # ≈ $645 at 1550 NGN/USD
-            "supplier_name": "Test",
-            "supplier_bank": "Test Bank",
-            "supplier_account": "1234567890",
-            "pin": "1234",
-        }
-
+        # NGN 1,000,000 ≈ $645 at 1550 NGN/USD
         resp = await client.post(
-            "/api/v1/transactions/", json=payload, headers=auth_headers,
+            "/api/v1/transactions/", json=_CREATE_PAYLOAD, headers=auth_headers,
         )
         assert resp.status_code == 400
         assert "monthly limit" in resp.json()["detail"].lower()
@@ -450,36 +337,14 @@ class TestCreateTransaction:
 
 class TestGetTransaction:
 
-    def _make_txn(self, trader_id, **overrides):
-        """Helper to build a Transaction ORM object."""
-        defaults = dict(
-            trader_id=trader_id,
-            direction=TransactionDirection.NGN_TO_CNY,
-            source_amount=Decimal("1000000"),
-            target_amount=Decimal("4677.42"),
-            exchange_rate=Decimal("213.7931"),
-            fee_amount=Decimal("20000"),
-            fee_percentage=Decimal("2.00"),
-            supplier_name="Test Supplier",
-            supplier_bank="Test Bank",
-            status=TransactionStatus.INITIATED,
-        )
-        defaults.update(overrides)
-        return Transaction(**defaults)
-
     @pytest.mark.asyncio
     async def test_get_own_transaction_200(
-        self, client, mock_db, trader_with_pin, auth_headers,
+        self, client, mock_db, trader_with_pin, auth_headers, make_transaction,
     ):
         """Owner can retrieve their transaction."""
-        txn = self._make_txn(trader_with_pin.id)
-
-        trader_result = MagicMock()
-        trader_result.scalar_one_or_none = MagicMock(return_value=trader_with_pin)
-        txn_result = MagicMock()
-        txn_result.scalar_one_or_none = MagicMock(return_value=txn)
+        txn = make_transaction(trader_with_pin.id)
 
-        mock_db.execute = AsyncMock(side_effect=[trader_result, txn_result])
+        mock_db.execute = execute_returning(Result(trader_with_pin), Result(txn))
 
         resp = await client.get(
             f"/api/v1/transactions/{txn.id}", headers=auth_headers,
@@ -496,12 +361,7 @@ class TestGetTransaction:
         self, client, mock_db, trader_with_pin, auth_headers,
     ):
         """Non-existent transaction returns 404."""
-        trader_result = MagicMock()
-        trader_result.scalar_one_or_none = MagicMock(return_value=trader_with_pin)
-        txn_result = MagicMock()
-        txn_result.scalar_one_or_none = MagicMock(return_value=None)
-
-        mock_db.execute = AsyncMock(side_effect=[trader_result, txn_result])
+        mock_db.execute = execute_returning(Result(trader_with_pin), Result(None))
 
         fake_id = str(uuid.uuid4())
         resp = await client.get(
@@ -512,18 +372,13 @@ class TestGetTransaction:
 
     @pytest.mark.asyncio
     async def test_get_other_traders_transaction_403(
-        self, client, mock_db, trader_with_pin, auth_headers,
+        self, client, mock_db, trader_with_pin, auth_headers, make_transaction,
     ):
         """Accessing another trader's transaction returns 403."""
         other_id = uuid.uuid4()
-        txn = self._make_txn(other_id)
+        txn = make_transaction(other_id)
 
-        trader_result = MagicMock()
-        trader_result.scalar_one_or_none = MagicMock(return_value=trader_with_pin)
-        txn_result = MagicMock()
-        txn_result.scalar_one_or_none = MagicMock(return_value=txn)
-
-        mock_db.execute = AsyncMock(side_effect=[trader_result, txn_result])
+        mock_db.execute = execute_returning(Result(trader_with_pin), Result(txn))
 
         resp = await client.get(
             f"/api/v1/transactions/{txn.id}", headers=auth_headers,
@@ -545,47 +400,29 @@ class TestGetTransaction:
 
 class TestListTransactions:
 
-    def _make_txns(self, trader_id, count=3):
+    def _make_txns(self, make_transaction, trader_id, count=3):
         """Create a list of Transaction instances for listing tests."""
-        txns = []
-        for i in range(count):
-            txns.append(
-                Transaction(
-                    trader_id=trader_id,
-                    direction=TransactionDirection.NGN_TO_CNY,
-                    source_amount=Decimal(str((i + 1) * 1000000)),
-                    target_amount=Decimal(str((i + 1) * 4677)),
-                    exchange_rate=Decimal("213.7931"),
-                    fee_amount=Decimal("20000"),
-                    fee_percentage=Decimal("2.00"),
-                    status=TransactionStatus.INITIATED,
-                )
+        return [
+            make_transaction(
+                trader_id,
+                source_amount=Decimal((i + 1) * 1000000),
+                target_amount=Decimal((i + 1) * 4677),
             )
-        return txns
+            for i in range(count)
+        ]
 
     def _setup_list_mocks(self, mock_db, trader, total, items):
         """Wire up the three db.execute calls for list endpoint."""
-        trader_result = MagicMock()
-        trader_result.scalar_one_or_none = MagicMock(return_value=trader)
-
-        count_result = MagicMock()
-        count_result.scalar_one = MagicMock(return_value=total)
-
-        items_result = MagicMock()
-        scalars_mock = MagicMock()
-        scalars_mock.all = MagicMock(return_value=items)
-        items_result.scalars = MagicMock(return_value=scalars_mock)
-
-        mock_db.execute = AsyncMock(
-            side_effect=[trader_result, count_result, items_result],
+        mock_db.execute = execute_returning(
+            Result(trader), Result(total), Result(items),
         )
 
     @pytest.mark.asyncio
     async def test_list_paginated_200(
-        self, client, mock_db, trader_with_pin, auth_headers,
+        self, client, mock_db, trader_with_pin, auth_headers, make_transaction,
     ):
         """Returns paginated transaction list."""
-        txns = self._make_txns(trader_with_pin.id, count=3)
+        txns = self._make_txns(make_transaction, trader_with_pin.id, count=3)
         self._setup_list_mocks(mock_db, trader_with_pin, total=3, items=txns)
 
         resp = await client.get("/api/v1/transactions/", headers=auth_headers)
@@ -672,46 +509,16 @@ class TestListTransactions:
 
 class TestCancelTransaction:
 
-    def _make_txn(self, trader_id, status=TransactionStatus.INITIATED):
-        """Helper to create a Transaction with given status."""
-        txn = Transaction(
-            trader_id=trader_id,
-            direction=TransactionDirection.NGN_TO_CNY,
-            source_amount=Decimal("1000000"),
-            target_amount=Decimal("4677.42"),
-            exchange_rate=Decimal("213.7931"),
-            fee_amount=Decimal("20000"),
-            fee_percentage=Decimal("2.00"),
-            supplier_name="Test Supplier",
-            supplier_bank="Test Bank",
-            status=TransactionStatus.INITIATED,
-        )
-        # Walk to desired status if not INITIATED
-        if status == TransactionStatus.FUNDED:
-            txn.transition_to(TransactionStatus.FUNDED)
-        elif status == TransactionStatus.COMPLETED:
-            txn.transition_to(TransactionStatus.FUNDED)
-            txn.transition_to(TransactionStatus.MATCHING)
-            txn.transition_to(TransactionStatus.MATCHED)
-            txn.transition_to(TransactionStatus.PENDING_SETTLEMENT)
-            txn.transition_to(TransactionStatus.SETTLING)
-            txn.transition_to(TransactionStatus.COMPLETED)
-        return txn
-
     def _setup_cancel_mocks(self, mock_db, trader, txn):
         """Wire trader + transaction lookup for cancel endpoint."""
-        trader_result = MagicMock()
-        trader_result.scalar_one_or_none = MagicMock(return_value=trader)
-        txn_result = MagicMock()
-        txn_result.scalar_one_or_none = MagicMock(return_value=txn)
-        mock_db.execute = AsyncMock(side_effect=[trader_result, txn_result])
+        mock_db.execute = execute_returning(Result(trader), Result(txn))
 
     @pytest.mark.asyncio
     async def test_cancel_initiated_200(
-        self, client, mock_db, trader_with_pin, auth_headers,
+        self, client, mock_db, trader_with_pin, auth_headers, make_transaction,
     ):
         """INITIATED transaction can be cancelled."""
-        txn = self._make_txn(trader_with_pin.id)
+        txn = make_transaction(trader_with_pin.id)
         self._setup_cancel_mocks(mock_db, trader_with_pin, txn)
 
         resp = await client.post(
@@ -724,10 +531,10 @@ class TestCancelTransaction:
 
     @pytest.mark.asyncio
     async def test_cancel_funded_409(
-        self, client, mock_db, trader_with_pin, auth_headers,
+        self, client, mock_db, trader_with_pin, auth_headers, make_transaction,
     ):
         """FUNDED transaction cannot be cancelled via this endpoint (409)."""
-        txn = self._make_txn(trader_with_pin.id, status=TransactionStatus.FUNDED)
+        txn = make_transaction(trader_with_pin.id, status=TransactionStatus.FUNDED)
         self._setup_cancel_mocks(mock_db, trader_with_pin, txn)
 
         resp = await client.post(
@@ -740,10 +547,10 @@ class TestCancelTransaction:
 
     @pytest.mark.asyncio
     async def test_cancel_completed_409(
-        self, client, mock_db, trader_with_pin, auth_headers,
+        self, client, mock_db, trader_with_pin, auth_headers, make_transaction,
     ):
         """COMPLETED transaction cannot be cancelled (409)."""
-        txn = self._make_txn(trader_with_pin.id, status=TransactionStatus.COMPLETED)
+        txn = make_transaction(trader_with_pin.id, status=TransactionStatus.COMPLETED)
         self._setup_cancel_mocks(mock_db, trader_with_pin, txn)
 
         resp = await client.post(
@@ -756,10 +563,10 @@ class TestCancelTransaction:
 
     @pytest.mark.asyncio
     async def test_cancel_wrong_pin_401(
-        self, client, mock_db, trader_with_pin, auth_headers,
+        self, client, mock_db, trader_with_pin, auth_headers, make_transaction,
     ):
         """Wrong PIN returns 401."""
-        txn = self._make_txn(trader_with_pin.id)
+        txn = make_transaction(trader_with_pin.id)
         self._setup_cancel_mocks(mock_db, trader_with_pin, txn)
 
         resp = await client.post(
@@ -775,11 +582,7 @@ class TestCancelTransaction:
         self, client, mock_db, trader_with_pin, auth_headers,
     ):
         """Cancel non-existent transaction returns 404."""
-        trader_result = MagicMock()
-        trader_result.scalar_one_or_none = MagicMock(return_value=trader_with_pin)
-        txn_result = MagicMock()
-        txn_result.scalar_one_or_none = MagicMock(return_value=None)
-        mock_db.execute = AsyncMock(side_effect=[trader_result, txn_result])
+        mock_db.execute = execute_returning(Result(trader_with_pin), Result(None))
 
         fake_id = str(uuid.uuid4())
         resp = await client.post(
@@ -791,11 +594,11 @@ class TestCancelTransaction:
 
     @pytest.mark.asyncio
     async def test_cancel_other_traders_txn_403(
-        self, client, mock_db, trader_with_pin, auth_headers,
+        self, client, mock_db, trader_with_pin, auth_headers, make_transaction,
     ):
         """Cannot cancel another trader's transaction (403)."""
         other_id = uuid.uuid4()
-        txn = self._make_txn(other_id)
+        txn = make_transaction(other_id)
         self._setup_cancel_mocks(mock_db, trader_with_pin, txn)
 
         resp = await client.post(
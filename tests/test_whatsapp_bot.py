@@ -5,6 +5,7 @@ media handling, and state expiry TTL.
 """
 
 import json
+from typing import NamedTuple
 from unittest.mock import AsyncMock, patch, MagicMock
 
 import pytest
@@ -33,10 +34,23 @@ def bot(mock_redis):
         yield WhatsAppBot()
 
 
-@pytest.fixture
-def patched_redis(mock_redis):
-    """Context manager that patches the bot module's redis."""
-    return patch("app.whatsapp.bot.redis", mock_redis)
+def _saved_state(mock_redis, index=-1) -> dict:
+    """Decode the state dict from the *index*-th SETEX the bot issued."""
+    return json.loads(mock_redis.setex.call_args_list[index].args[2])
+
+
+class _Sends(NamedTuple):
+    text: AsyncMock
+    menu: AsyncMock
+
+
+@pytest.fixture(autouse=True)
+def sends(monkeypatch):
+    """Stub the outbound WhatsApp senders the bot imports from messages."""
+    stubs = _Sends(text=AsyncMock(), menu=AsyncMock())
+    monkeypatch.setattr("app.whatsapp.messages.send_text", stubs.text)
+    monkeypatch.setattr("app.whatsapp.messages.send_menu", stubs.menu)
+    return stubs
 
 
 # ── State management ─────────────────────────────────────────────────────
@@ -46,27 +60,24 @@ class TestStateManagement:
     """get_state / set_state / clear_state."""
 
     @pytest.mark.asyncio
-    async def test_get_state_no_existing(self, bot, mock_redis, patched_redis):
+    async def test_get_state_no_existing(self, bot, mock_redis):
         """Returns default menu state when no state exists."""
-        with patched_redis:
-            state = await bot.get_state("+2348012345678")
+        state = await bot.get_state("+2348012345678")
         assert state == {"flow": "menu", "step": "start", "data": {}}
 
     @pytest.mark.asyncio
-    async def test_get_state_existing(self, bot, mock_redis, patched_redis):
+    async def test_get_state_existing(self, bot, mock_redis):
         """Returns stored state from Redis."""
         stored = {"flow": "payment", "step": "amount", "data": {"direction": "ngn_to_cny"}}
         mock_redis.get = AsyncMock(return_value=json.dumps(stored))
-        with patched_redis:
-            state = await bot.get_state("+2348012345678")
+        state = await bot.get_state("+2348012345678")
         assert state == stored
 
     @pytest.mark.asyncio
-    async def test_set_state_uses_15min_ttl(self, bot, mock_redis, patched_redis):
+    async def test_set_state_uses_15min_ttl(self, bot, mock_redis):
         """State is saved with 900-second (15-min) TTL."""
         state = {"flow": "payment", "step": "direction", "data": {}}
-        with patched_redis:
-            await bot.set_state("+2348012345678", state)
+        await bot.set_state("+2348012345678", state)
         mock_redis.setex.assert_called_once_with(
             f"{STATE_KEY_PREFIX}+2348012345678",
             STATE_TTL_SECONDS,
@@ -75,10 +86,9 @@ class TestStateManagement:
         assert STATE_TTL_SECONDS == 900
 
     @pytest.mark.asyncio
-    async def test_clear_state(self, bot, mock_redis, patched_redis):
+    async def test_clear_state(self, bot, mock_redis):
         """clear_state deletes the Redis key."""
-        with patched_redis:
-            await bot.clear_state("+2348012345678")
+        await bot.clear_state("+2348012345678")
         mock_redis.delete.assert_called_once_with(
             f"{STATE_KEY_PREFIX}+2348012345678",
         )
@@ -91,44 +101,33 @@ class TestGlobalCommands:
     """Global commands are handled regardless of current flow."""
 
     @pytest.mark.asyncio
-    async def test_cancel_clears_state_and_sends_menu(self, bot, mock_redis, patched_redis):
+    async def test_cancel_clears_state_and_sends_menu(self, bot, mock_redis, sends):
         """CANCEL clears state and sends the main menu."""
         with (
-            patched_redis,
             patch("app.whatsapp.bot.menu") as mock_menu_flow,
-            patch("app.whatsapp.messages.send_text", new_callable=AsyncMock) as mock_send_text,
-            patch("app.whatsapp.messages.send_menu", new_callable=AsyncMock) as mock_send_menu,
         ):
             await bot.handle_message("+2348012345678", "cancel")
 
         mock_redis.delete.assert_called_once()
-        mock_send_text.assert_called_once()
-        assert "Cancelled" in mock_send_text.call_args[0][1]
-        mock_send_menu.assert_called_once()
+        sends.text.assert_called_once()
+        assert "Cancelled" in sends.text.call_args[0][1]
+        sends.menu.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_help_sends_help_text(self, bot, mock_redis, patched_redis):
+    async def test_help_sends_help_text(self, bot, mock_redis, sends):
         """HELP sends a help message with available commands."""
-        with (
-            patched_redis,
-            patch("app.whatsapp.messages.send_text", new_callable=AsyncMock) as mock_send_text,
-            patch("app.whatsapp.messages.send_menu", new_callable=AsyncMock),
-        ):
-            await bot.handle_message("+2348012345678", "help")
+        await bot.handle_message("+2348012345678", "help")
 
-        mock_send_text.assert_called_once()
-        help_text = mock_send_text.call_args[0][1]
+        sends.text.assert_called_once()
+        help_text = sends.text.call_args[0][1]
         assert "Help" in help_text
         assert "menu" in help_text
         assert "cancel" in help_text
 
     @pytest.mark.asyncio
-    async def test_status_command_enters_status_flow(self, bot, mock_redis, patched_redis):
+    async def test_status_command_enters_status_flow(self, bot, mock_redis):
         """STATUS global command transitions to status flow."""
         with (
-            patched_redis,
-            patch("app.whatsapp.messages.send_text", new_callable=AsyncMock),
-            patch("app.whatsapp.messages.send_menu", new_callable=AsyncMock),
             patch("app.whatsapp.flows.status.get_trader_by_phone", new_callable=AsyncMock, return_value=None),
         ):
             await bot.handle_message("+2348012345678", "status")
@@ -137,41 +136,26 @@ class TestGlobalCommands:
         assert mock_redis.setex.called
 
     @pytest.mark.asyncio
-    async def test_menu_command_clears_state(self, bot, mock_redis, patched_redis):
+    async def test_menu_command_clears_state(self, bot, mock_redis, sends):
         """MENU global command clears state and sends menu."""
-        with (
-            patched_redis,
-            patch("app.whatsapp.messages.send_text", new_callable=AsyncMock),
-            patch("app.whatsapp.messages.send_menu", new_callable=AsyncMock) as mock_send_menu,
-        ):
-            await bot.handle_message("+2348012345678", "menu")
+        await bot.handle_message("+2348012345678", "menu")
 
         mock_redis.delete.assert_called_once()
-        mock_send_menu.assert_called_once()
+        sends.menu.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_global_command_case_insensitive(self, bot, mock_redis, patched_redis):
+    async def test_global_command_case_insensitive(self, bot, mock_redis, sends):
         """Global commands work regardless of case."""
-        with (
-            patched_redis,
-            patch("app.whatsapp.messages.send_text", new_callable=AsyncMock) as mock_send_text,
-            patch("app.whatsapp.messages.send_menu", new_callable=AsyncMock),
-        ):
-            await bot.handle_message("+2348012345678", "HELP")
+        await bot.handle_message("+2348012345678", "HELP")
 
-        mock_send_text.assert_called_once()
-        assert "Help" in mock_send_text.call_args[0][1]
+        sends.text.assert_called_once()
+        assert "Help" in sends.text.call_args[0][1]
 
     @pytest.mark.asyncio
-    async def test_non_global_routes_to_flow(self, bot, mock_redis, patched_redis):
+    async def test_non_global_routes_to_flow(self, bot, mock_redis):
         """Non-global text is routed to the current flow handler."""
-        with (
-            patched_redis,
-            patch("app.whatsapp.messages.send_text", new_callable=AsyncMock),
-            patch("app.whatsapp.messages.send_menu", new_callable=AsyncMock),
-        ):
-            # Default state is menu flow. "hi" triggers menu display.
-            await bot.handle_message("+2348012345678", "hi")
+        # Default state is menu flow. "hi" triggers menu display.
+        await bot.handle_message("+2348012345678", "hi")
 
         # Should have set state (menu flow responded)
         assert mock_redis.setex.called
@@ -184,57 +168,42 @@ class TestFlowRouting:
     """Messages are routed to the correct flow based on state."""
 
     @pytest.mark.asyncio
-    async def test_menu_routes_pay_to_payment_flow(self, bot, mock_redis, patched_redis):
+    async def test_menu_routes_pay_to_payment_flow(self, bot, mock_redis):
         """Typing 'pay' from menu routes to payment (or menu if unregistered)."""
         from app.models.trader import Trader, TraderStatus
         trader = Trader(phone="+2348012345678", full_name="Test User", status=TraderStatus.ACTIVE)
         with (
-            patched_redis,
-            patch("app.whatsapp.messages.send_text", new_callable=AsyncMock),
-            patch("app.whatsapp.messages.send_menu", new_callable=AsyncMock),
             patch("app.whatsapp.flows.menu.get_trader_by_phone", new_callable=AsyncMock, return_value=trader),
         ):
             await bot.handle_message("+2348012345678", "pay")
 
-        last_call = mock_redis.setex.call_args_list[-1]
-        saved_state = json.loads(last_call[0][2])
+        saved_state = _saved_state(mock_redis)
         assert saved_state["flow"] == "payment"
 
     @pytest.mark.asyncio
-    async def test_menu_routes_register_to_registration_flow(self, bot, mock_redis, patched_redis):
+    async def test_menu_routes_register_to_registration_flow(self, bot, mock_redis):
         """Typing 'register' from menu transitions to registration flow."""
-        with (
-            patched_redis,
-            patch("app.whatsapp.messages.send_text", new_callable=AsyncMock),
-            patch("app.whatsapp.messages.send_menu", new_callable=AsyncMock),
-        ):
-            await bot.handle_message("+2348012345678", "register")
+        await bot.handle_message("+2348012345678", "register")
 
-        last_call = mock_redis.setex.call_args_list[-1]
-        saved_state = json.loads(last_call[0][2])
+        saved_state = _saved_state(mock_redis)
         assert saved_state["flow"] == "registration"
 
     @pytest.mark.asyncio
-    async def test_payment_flow_direction_step(self, bot, mock_redis, patched_redis):
+    async def test_payment_flow_direction_step(self, bot, mock_redis):
         """Payment flow: direction step stores chosen direction."""
         # Simulate being in payment flow at direction step
         mock_redis.get = AsyncMock(
             return_value=json.dumps({"flow": "payment", "step": "direction", "data": {}})
         )
-        with (
-            patched_redis,
-            patch("app.whatsapp.messages.send_text", new_callable=AsyncMock),
-        ):
-            await bot.handle_message("+2348012345678", "1")
+        await bot.handle_message("+2348012345678", "1")
 
-        last_call = mock_redis.setex.call_args_list[-1]
-        saved_state = json.loads(last_call[0][2])
+        saved_state = _saved_state(mock_redis)
         assert saved_state["flow"] == "payment"
         assert saved_state["step"] == "amount_input"
         assert saved_state["data"]["direction"] == "ngn_to_cny"
 
     @pytest.mark.asyncio
-    async def test_payment_flow_amount_step_valid(self, bot, mock_redis, patched_redis):
+    async def test_payment_flow_amount_step_valid(self, bot, mock_redis):
         """Payment flow: valid amount generates quote and moves to rate_display."""
         mock_redis.get = AsyncMock(
             return_value=json.dumps({
@@ -252,22 +221,19 @@ class TestFlowRouting:
         mock_svc = AsyncMock()
         mock_svc.generate_quote = AsyncMock(return_value=mock_quote)
         with (
-            patched_redis,
             patch("app.whatsapp.flows.payment.RateService", return_value=mock_svc),
             patch("app.whatsapp.flows.payment.get_user_lang", new_callable=AsyncMock, return_value="en"),
-            patch("app.whatsapp.messages.send_text", new_callable=AsyncMock),
             patch("app.whatsapp.flows.payment.send_rate_quote", new_callable=AsyncMock),
             patch("app.whatsapp.flows.payment.send_button", new_callable=AsyncMock),
         ):
             await bot.handle_message("+2348012345678", "50m")
 
-        last_call = mock_redis.setex.call_args_list[-1]
-        saved_state = json.loads(last_call[0][2])
+        saved_state = _saved_state(mock_redis)
         assert saved_state["step"] == "rate_display"
         assert saved_state["data"]["quote"] is not None
 
     @pytest.mark.asyncio
-    async def test_payment_flow_amount_step_invalid(self, bot, mock_redis, patched_redis):
+    async def test_payment_flow_amount_step_invalid(self, bot, mock_redis):
         """Payment flow: invalid amount keeps user on same step."""
         mock_redis.get = AsyncMock(
             return_value=json.dumps({
@@ -276,32 +242,27 @@ class TestFlowRouting:
             })
         )
         with (
-            patched_redis,
             patch("app.whatsapp.flows.payment.send_text", new_callable=AsyncMock) as mock_send,
         ):
             await bot.handle_message("+2348012345678", "xyz invalid")
 
-        last_call = mock_redis.setex.call_args_list[-1]
-        saved_state = json.loads(last_call[0][2])
+        saved_state = _saved_state(mock_redis)
         assert saved_state["step"] == "amount_input"  # stays on same step
         assert "couldn't understand" in mock_send.call_args[0][1].lower()
 
     @pytest.mark.asyncio
-    async def test_registration_flow_language_selection(self, bot, mock_redis, patched_redis):
+    async def test_registration_flow_language_selection(self, bot, mock_redis):
         """Registration flow: language selection stores lang and advances."""
         mock_redis.get = AsyncMock(
             return_value=json.dumps({"flow": "registration", "step": "language", "data": {}})
         )
         with (
-            patched_redis,
             patch("app.whatsapp.flows.registration.set_user_lang", new_callable=AsyncMock),
-            patch("app.whatsapp.messages.send_text", new_callable=AsyncMock),
             patch("app.whatsapp.flows.registration.send_button", new_callable=AsyncMock),
         ):
             await bot.handle_message("+2348012345678", "1")
 
-        last_call = mock_redis.setex.call_args_list[-1]
-        saved_state = json.loads(last_call[0][2])
+        saved_state = _saved_state(mock_redis)
         assert saved_state["step"] == "phone_confirm"
         assert saved_state["data"]["lang"] == "en"
 
@@ -312,50 +273,38 @@ class TestFlowRouting:
 class TestInteractiveRouting:
     """Button and list replies are routed correctly."""
 
+    @pytest.mark.parametrize("reply_id, expected_flow", [
+        ("action_pay", "payment"),
+        ("action_status", "status"),
+        ("action_register", "registration"),
+    ])
     @pytest.mark.asyncio
-    async def test_action_pay_button(self, bot, mock_redis, patched_redis):
-        """action_pay button reply transitions to payment flow (registered user)."""
+    async def test_action_button_enters_flow(
+        self, bot, mock_redis, reply_id, expected_flow,
+    ):
+        """Main-menu buttons move a registered trader into the matching flow."""
         from app.models.trader import Trader, TraderStatus
         trader = Trader(phone="+2348012345678", full_name="Test User", status=TraderStatus.ACTIVE)
         with (
-            patched_redis,
-            patch("app.whatsapp.messages.send_text", new_callable=AsyncMock),
-            patch("app.whatsapp.messages.send_menu", new_callable=AsyncMock),
             patch("app.whatsapp.flows.menu.get_trader_by_phone", new_callable=AsyncMock, return_value=trader),
         ):
-            await bot.handle_interactive("+2348012345678", "action_pay")
-
-        last_call = mock_redis.setex.call_args_list[-1]
-        saved_state = json.loads(last_call[0][2])
-        assert saved_state["flow"] == "payment"
-
-    @pytest.mark.asyncio
-    async def test_action_status_button(self, bot, mock_redis, patched_redis):
-        """action_status button reply transitions to status flow."""
-        with (
-            patched_redis,
-            patch("app.whatsapp.messages.send_text", new_callable=AsyncMock),
-            patch("app.whatsapp.messages.send_menu", new_callable=AsyncMock),
-        ):
-            await bot.handle_interactive("+2348012345678", "action_status")
+            await bot.handle_interactive("+2348012345678", reply_id)
 
-        last_call = mock_redis.setex.call_args_list[-1]
-        saved_state = json.loads(last_call[0][2])
-        assert saved_state["flow"] == "status"
+        saved_state = _saved_state(mock_redis)
+        assert saved_state["flow"] == expected_flow
 
     @pytest.mark.asyncio
-    async def test_action_register_button(self, bot, mock_redis, patched_redis):
-        """action_register button reply transitions to registration flow."""
+    async def test_unknown_button_shows_menu(self, bot, mock_redis):
+        """An unrecognised reply id re-sends the menu and stays on it."""
         with (
-            patched_redis,
-            patch("app.whatsapp.messages.send_text", new_callable=AsyncMock),
-            patch("app.whatsapp.messages.send_menu", new_callable=AsyncMock),
+            patch("app.whatsapp.flows.menu.send_menu", new_callable=AsyncMock) as mock_menu,
         ):
-            await bot.handle_interactive("+2348012345678", "action_register")
+            await bot.handle_interactive("+2348012345678", "action_bogus")
 
-        last_call = mock_redis.setex.call_args_list[-1]
-        saved_state = json.loads(last_call[0][2])
-        assert saved_state["flow"] == "registration"
+        mock_menu.assert_called_once()
+        saved_state = _saved_state(mock_redis)
+        assert saved_state["flow"] == "menu"
+        assert saved_state["step"] == "awaiting_selection"
 
 
 # ── Media handling ───────────────────────────────────────────────────────
@@ -365,13 +314,16 @@ class TestMediaHandling:
     """handle_media stores media info and routes captions."""
 
     @pytest.mark.asyncio
-    async def test_image_with_caption(self, bot, mock_redis, patched_redis):
-        """Image with caption stores media and routes caption as text."""
-        with (
-            patched_redis,
-            patch("app.whatsapp.messages.send_text", new_callable=AsyncMock),
-            patch("app.whatsapp.messages.send_menu", new_callable=AsyncMock),
-        ):
+    async def test_image_with_caption(self, bot, mock_redis):
+        """Media is saved before the caption is routed; a None reply adds no write."""
+        flow = MagicMock()
+
+        async def _mutate_and_return_none(sender, text, state):
+            state["data"]["invoice_media"] = state["data"].pop("last_media")
+            return None
+
+        flow.handle_text = AsyncMock(side_effect=_mutate_and_return_none)
+        with patch.dict(WhatsAppBot.FLOWS, {"menu": flow}):
             await bot.handle_media(
                 sender="+2348012345678",
                 media_type="image",
@@ -379,33 +331,93 @@ class TestMediaHandling:
                 caption="hi",
             )
 
-        # Should have stored media in state AND routed caption
-        assert mock_redis.setex.call_count >= 1
-        first_set = json.loads(mock_redis.setex.call_args_list[0][0][2])
-        assert first_set["data"]["last_media"]["type"] == "image"
-        assert first_set["data"]["last_media"]["media_id"] == "img-123"
+        flow.handle_text.assert_awaited_once()
+        assert flow.handle_text.call_args.kwargs["text"] == "hi"
+
+        # One read, one write: the media state as it was before routing
+        mock_redis.get.assert_awaited_once()
+        mock_redis.setex.assert_called_once()
+        saved_state = _saved_state(mock_redis)
+        assert saved_state["data"]["last_media"]["type"] == "image"
+        assert saved_state["data"]["last_media"]["media_id"] == "img-123"
+        assert "invoice_media" not in saved_state["data"]
+
+    @pytest.mark.asyncio
+    async def test_image_caption_new_state_saved(self, bot, mock_redis):
+        """A new state returned for the caption is written after the media."""
+        new_state = {
+            "flow": "payment",
+            "step": "summary_confirm",
+            "data": {"invoice_media": {"media_id": "img-123"}},
+        }
+        flow = MagicMock()
+        flow.handle_text = AsyncMock(return_value=new_state)
+        with patch.dict(WhatsAppBot.FLOWS, {"menu": flow}):
+            await bot.handle_media(
+                sender="+2348012345678",
+                media_type="image",
+                media_id="img-123",
+                caption="uploaded",
+            )
+
+        routed = flow.handle_text.call_args.kwargs
+        assert routed["state"]["data"]["last_media"]["media_id"] == "img-123"
+
+        assert mock_redis.setex.call_count == 2
+        assert _saved_state(mock_redis, 0)["data"]["last_media"]["media_id"] == "img-123"
+        assert _saved_state(mock_redis) == new_state
 
     @pytest.mark.asyncio
-    async def test_document_without_caption(self, bot, mock_redis, patched_redis):
-        """Document without caption stores media and sends acknowledgement."""
+    async def test_image_caption_flow_error_keeps_media(self, bot, mock_redis):
+        """If the caption's flow handler raises, the upload is already saved."""
+        flow = MagicMock()
+        flow.handle_text = AsyncMock(side_effect=RuntimeError("send failed"))
         with (
-            patched_redis,
-            patch("app.whatsapp.messages.send_text", new_callable=AsyncMock) as mock_send,
+            patch.dict(WhatsAppBot.FLOWS, {"menu": flow}),
+            pytest.raises(RuntimeError),
         ):
             await bot.handle_media(
                 sender="+2348012345678",
-                media_type="document",
-                media_id="doc-456",
-                filename="invoice.pdf",
+                media_type="image",
+                media_id="img-123",
+                caption="hi",
             )
 
+        mock_redis.setex.assert_called_once()
+        assert _saved_state(mock_redis)["data"]["last_media"]["media_id"] == "img-123"
+
+    @pytest.mark.asyncio
+    async def test_image_with_command_caption(self, bot, mock_redis, sends):
+        """A global command as caption still runs, after the media is saved."""
+        await bot.handle_media(
+            sender="+2348012345678",
+            media_type="image",
+            media_id="img-123",
+            caption="cancel",
+        )
+
+        saved_state = _saved_state(mock_redis)
+        assert saved_state["data"]["last_media"]["media_id"] == "img-123"
+        mock_redis.delete.assert_called_once()
+        sends.menu.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_document_without_caption(self, bot, mock_redis, sends):
+        """Document without caption stores media and sends acknowledgement."""
+        await bot.handle_media(
+            sender="+2348012345678",
+            media_type="document",
+            media_id="doc-456",
+            filename="invoice.pdf",
+        )
+
         # Should store media and send ack
         assert mock_redis.setex.called
-        saved_state = json.loads(mock_redis.setex.call_args_list[0][0][2])
+        saved_state = _saved_state(mock_redis, 0)
         assert saved_state["data"]["last_media"]["filename"] == "invoice.pdf"
 
-        mock_send.assert_called_once()
-        assert "document" in mock_send.call_args[0][1]
+        sends.text.assert_called_once()
+        assert "document" in sends.text.call_args[0][1]
 
 
 # ── Cancel mid-flow ──────────────────────────────────────────────────────
@@ -415,7 +427,7 @@ class TestCancelMidFlow:
     """CANCEL works from any flow step."""
 
     @pytest.mark.asyncio
-    async def test_cancel_from_payment_flow(self, bot, mock_redis, patched_redis):
+    async def test_cancel_from_payment_flow(self, bot, mock_redis, sends):
         """Cancel during payment flow returns to menu."""
         mock_redis.get = AsyncMock(
             return_value=json.dumps({
@@ -423,18 +435,13 @@ class TestCancelMidFlow:
                 "data": {"direction": "ngn_to_cny", "amount": "50000000"},
             })
         )
-        with (
-            patched_redis,
-            patch("app.whatsapp.messages.send_text", new_callable=AsyncMock),
-            patch("app.whatsapp.messages.send_menu", new_callable=AsyncMock) as mock_menu,
-        ):
-            await bot.handle_message("+2348012345678", "cancel")
+        await bot.handle_message("+2348012345678", "cancel")
 
         mock_redis.delete.assert_called_once()
-        mock_menu.assert_called_once()
+        sends.menu.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_cancel_from_registration_flow(self, bot, mock_redis, patched_redis):
+    async def test_cancel_from_registration_flow(self, bot, mock_redis, sends):
         """Cancel during registration flow returns to menu."""
         mock_redis.get = AsyncMock(
             return_value=json.dumps({
@@ -442,12 +449,7 @@ class TestCancelMidFlow:
                 "data": {"business_name": "Test Corp"},
             })
         )
-        with (
-            patched_redis,
-            patch("app.whatsapp.messages.send_text", new_callable=AsyncMock),
-            patch("app.whatsapp.messages.send_menu", new_callable=AsyncMock) as mock_menu,
-        ):
-            await bot.handle_message("+2348012345678", "CANCEL")
+        await bot.handle_message("+2348012345678", "CANCEL")
 
         mock_redis.delete.assert_called_once()
-        mock_menu.assert_called_once()
+        sends.menu.assert_called_once()
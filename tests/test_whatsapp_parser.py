@@ -9,84 +9,68 @@ from app.whatsapp.parser import parse_amount
 class TestAmountParser:
     """Tests for Nigerian currency amount parsing."""
 
-    def test_plain_number(self):
-        assert parse_amount("5000000") == Decimal("5000000")
-
-    def test_with_commas(self):
-        assert parse_amount("5,000,000") == Decimal("5000000")
-
-    def test_naira_prefix_n(self):
-        assert parse_amount("N50,000,000") == Decimal("50000000")
-
-    def test_naira_prefix_symbol(self):
-        assert parse_amount("₦50,000,000") == Decimal("50000000")
-
-    def test_millions_suffix_lowercase(self):
-        assert parse_amount("50m") == Decimal("50000000")
-
-    def test_millions_suffix_uppercase(self):
-        assert parse_amount("50M") == Decimal("50000000")
-
-    def test_thousands_suffix(self):
-        assert parse_amount("50k") == Decimal("50000")
-
-    def test_billions_suffix(self):
-        assert parse_amount("2b") == Decimal("2000000000")
-
-    def test_decimal_with_suffix(self):
-        assert parse_amount("1.5m") == Decimal("1500000")
-
-    def test_naira_prefix_with_suffix(self):
-        assert parse_amount("N50m") == Decimal("50000000")
-
-    def test_invalid_text(self):
-        assert parse_amount("hello") is None
-
-    def test_empty_string(self):
-        assert parse_amount("") is None
-
-    def test_zero(self):
-        assert parse_amount("0") is None
-
-    def test_negative(self):
-        assert parse_amount("-5000") is None
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            pytest.param("5000000", Decimal("5000000"), id="plain_number"),
+            pytest.param("5,000,000", Decimal("5000000"), id="with_commas"),
+            pytest.param("N50,000,000", Decimal("50000000"), id="naira_prefix_n"),
+            pytest.param("₦50,000,000", Decimal("50000000"), id="naira_prefix_symbol"),
+            pytest.param("50m", Decimal("50000000"), id="millions_suffix_lowercase"),
+            pytest.param("50M", Decimal("50000000"), id="millions_suffix_uppercase"),
+            pytest.param("50k", Decimal("50000"), id="thousands_suffix"),
+            pytest.param("2b", Decimal("2000000000"), id="billions_suffix"),
+            pytest.param("1.5m", Decimal("1500000"), id="decimal_with_suffix"),
+            pytest.param("N50m", Decimal("50000000"), id="naira_prefix_with_suffix"),
+        ],
+    )
+    def test_parses(self, text, expected):
+        assert parse_amount(text) == expected
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            pytest.param("hello", id="invalid_text"),
+            pytest.param("", id="empty_string"),
+            pytest.param("0", id="zero"),
+            pytest.param("-5000", id="negative"),
+        ],
+    )
+    def test_rejects(self, text):
+        assert parse_amount(text) is None
 
 
 class TestWordFormParser:
     """Tests for English word-form number parsing."""
 
-    def test_fifty_million(self):
-        assert parse_amount("fifty million") == Decimal("50000000")
-
-    def test_two_hundred_thousand(self):
-        assert parse_amount("two hundred thousand") == Decimal("200000")
-
-    def test_five_billion(self):
-        assert parse_amount("five billion") == Decimal("5000000000")
-
-    def test_one_million(self):
-        assert parse_amount("one million") == Decimal("1000000")
-
-    def test_ten_thousand(self):
-        assert parse_amount("ten thousand") == Decimal("10000")
-
-    def test_one_hundred_fifty_million(self):
-        assert parse_amount("one hundred fifty million") == Decimal("150000000")
-
-    def test_twenty_five_thousand(self):
-        assert parse_amount("twenty five thousand") == Decimal("25000")
-
-    def test_million_alone(self):
-        """Single scale word: 'million' -> 1,000,000."""
-        assert parse_amount("million") == Decimal("1000000")
-
-    def test_case_insensitive(self):
-        assert parse_amount("Fifty Million") == Decimal("50000000")
-
-    def test_word_form_invalid(self):
-        """Random text should not match word-form parser."""
-        assert parse_amount("please send money") is None
-
-    def test_word_form_zero_word(self):
-        """'zero' should return None (amount must be > 0)."""
-        assert parse_amount("zero") is None
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            pytest.param("fifty million", Decimal("50000000"), id="fifty_million"),
+            pytest.param("two hundred thousand", Decimal("200000"), id="two_hundred_thousand"),
+            pytest.param("five billion", Decimal("5000000000"), id="five_billion"),
+            pytest.param("one million", Decimal("1000000"), id="one_million"),
+            pytest.param("ten thousand", Decimal("10000"), id="ten_thousand"),
+            pytest.param("one hundred fifty million", Decimal("150000000"), id="one_hundred_fifty_million"),
+            pytest.param("twenty five thousand", Decimal("25000"), id="twenty_five_thousand"),
+            # Single scale word: 'million' -> 1,000,000
+            pytest.param("million", Decimal("1000000"), id="million_alone"),
+            pytest.param("Fifty Million", Decimal("50000000"), id="case_insensitive"),
+            pytest.param("one hundred and fifty million", Decimal("150000000"), id="and_connector"),
+        ],
+    )
+    def test_parses(self, text, expected):
+        assert parse_amount(text) == expected
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            # Random text should not match word-form parser
+            pytest.param("please send money", id="word_form_invalid"),
+            # Amount must be > 0
+            pytest.param("zero", id="word_form_zero_word"),
+            pytest.param("and", id="connector_only"),
+        ],
+    )
+    def test_rejects(self, text):
+        assert parse_amount(text) is None